@@ -175,6 +175,7 @@ __all__ = [
     "CaselessLiteral",
     "CharsNotIn",
     "Combine",
+    "CompactParseResults",
     "Dict",
     "Each",
     "Empty",
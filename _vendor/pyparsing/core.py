@@ -26,13 +26,15 @@ from collections.abc import Iterable
 import traceback
 import types
 from operator import itemgetter
-from functools import wraps
+from functools import partial, wraps
 from threading import RLock
 from pathlib import Path
 
 from .util import (
     _FifoCache,
     _UnboundedCache,
+    _ThreadLocalCache,
+    _packrat_policies,
     __config_flags,
     _collapse_string_to_ranges,
     _escape_regex_range_chars,
@@ -458,6 +460,8 @@ class ParserElement(ABC):
         self.customName = None
         self._defaultName = None
         self.resultsName = None
+        # type of the ParseResults this expression returns its tokens in
+        self.resultsClass = ParseResults
         self.saveAsList = savelist
         self.skipWhitespace = True
         self.whiteChars = set(ParserElement.DEFAULT_WHITE_CHARS)
@@ -822,7 +826,7 @@ class ParserElement(ABC):
 
         tokens = self.postParse(instring, loc, tokens)
 
-        ret_tokens = ParseResults(
+        ret_tokens = self.resultsClass(
             tokens, self.resultsName, asList=self.saveAsList, modal=self.modalResults
         )
         if self.parseAction and (doActions or self.callDuringTry):
@@ -836,7 +840,7 @@ class ParserElement(ABC):
                             raise exc from parse_action_exc
 
                         if tokens is not None and tokens is not ret_tokens:
-                            ret_tokens = ParseResults(
+                            ret_tokens = self.resultsClass(
                                 tokens,
                                 self.resultsName,
                                 asList=self.saveAsList
@@ -859,7 +863,7 @@ class ParserElement(ABC):
                         raise exc from parse_action_exc
 
                     if tokens is not None and tokens is not ret_tokens:
-                        ret_tokens = ParseResults(
+                        ret_tokens = self.resultsClass(
                             tokens,
                             self.resultsName,
                             asList=self.saveAsList
@@ -908,51 +912,77 @@ class ParserElement(ABC):
     # we can cache these arguments and save ourselves the trouble of re-parsing the contained expression
     def _parseCache(
         self, instring, loc, doActions=True, callPreParse=True
+    ) -> Tuple[int, ParseResults]:
+        with ParserElement.packrat_cache_lock:
+            return self._parseCacheWith(
+                ParserElement.packrat_cache,
+                ParserElement.packrat_cache_stats,
+                instring,
+                loc,
+                doActions,
+                callPreParse,
+            )
+
+    # the same, for per-thread packrat caches (see enable_packrat): each
+    # thread probes only its own cache and counters, so no lock is taken
+    def _parseCacheThreadLocal(
+        self, instring, loc, doActions=True, callPreParse=True
+    ) -> Tuple[int, ParseResults]:
+        local_data = ParserElement.packrat_cache.local_data
+        try:
+            cache, stats = local_data.cache, local_data.stats
+        except AttributeError:
+            cache, stats = ParserElement.packrat_cache.local()
+        return self._parseCacheWith(
+            cache, stats, instring, loc, doActions, callPreParse
+        )
+
+    # the body of both of the above, probing ``cache`` and counting hits and
+    # misses in ``stats``
+    def _parseCacheWith(
+        self, cache, stats, instring, loc, doActions, callPreParse
     ) -> Tuple[int, ParseResults]:
         HIT, MISS = 0, 1
-        TRY, MATCH, FAIL = 0, 1, 2
         lookup = (self, instring, loc, callPreParse, doActions)
-        with ParserElement.packrat_cache_lock:
-            cache = ParserElement.packrat_cache
-            value = cache.get(lookup)
-            if value is cache.not_in_cache:
-                ParserElement.packrat_cache_stats[MISS] += 1
-                try:
-                    value = self._parseNoCache(instring, loc, doActions, callPreParse)
-                except ParseBaseException as pe:
-                    # cache a copy of the exception, without the traceback
-                    cache.set(lookup, pe.__class__(*pe.args))
-                    raise
-                else:
-                    cache.set(lookup, (value[0], value[1].copy(), loc))
-                    return value
+        value = cache.get(lookup)
+        if value is cache.not_in_cache:
+            stats[MISS] += 1
+            try:
+                value = self._parseNoCache(instring, loc, doActions, callPreParse)
+            except ParseBaseException as pe:
+                # cache a copy of the exception, without the traceback
+                cache.set(lookup, pe.__class__(*pe.args))
+                raise
             else:
-                ParserElement.packrat_cache_stats[HIT] += 1
-                if self.debug and self.debugActions.debug_try:
-                    try:
-                        self.debugActions.debug_try(instring, loc, self, cache_hit=True)
-                    except TypeError:
-                        pass
-                if isinstance(value, Exception):
-                    if self.debug and self.debugActions.debug_fail:
-                        try:
-                            self.debugActions.debug_fail(
-                                instring, loc, self, value, cache_hit=True
-                            )
-                        except TypeError:
-                            pass
-                    raise value
-
-                loc_, result, endloc = value[0], value[1].copy(), value[2]
-                if self.debug and self.debugActions.debug_match:
+                cache.set(lookup, (value[0], value[1].copy(), loc))
+                return value
+        else:
+            stats[HIT] += 1
+            if self.debug and self.debugActions.debug_try:
+                try:
+                    self.debugActions.debug_try(instring, loc, self, cache_hit=True)
+                except TypeError:
+                    pass
+            if isinstance(value, Exception):
+                if self.debug and self.debugActions.debug_fail:
                     try:
-                        self.debugActions.debug_match(
-                            instring, loc_, endloc, self, result, cache_hit=True
+                        self.debugActions.debug_fail(
+                            instring, loc, self, value, cache_hit=True
                         )
                     except TypeError:
                         pass
+                raise value
+
+            loc_, result, endloc = value[0], value[1].copy(), value[2]
+            if self.debug and self.debugActions.debug_match:
+                try:
+                    self.debugActions.debug_match(
+                        instring, loc_, endloc, self, result, cache_hit=True
+                    )
+                except TypeError:
+                    pass
 
-                return loc_, result
+            return loc_, result
 
     _parse = _parseNoCache
 
@@ -980,6 +1010,7 @@ class ParserElement(ABC):
         ParserElement._left_recursion_enabled = False
         ParserElement._packratEnabled = False
         ParserElement._parse = ParserElement._parseNoCache
+        ParserElement.packrat_cache_stats = [0, 0]
 
     @staticmethod
     def enable_left_recursion(
@@ -1030,7 +1061,13 @@ class ParserElement(ABC):
         ParserElement._left_recursion_enabled = True
 
     @staticmethod
-    def enable_packrat(cache_size_limit: int = 128, *, force: bool = False) -> None:
+    def enable_packrat(
+        cache_size_limit: int = 128,
+        *,
+        force: bool = False,
+        per_thread: bool = False,
+        policy: str = "fifo",
+    ) -> None:
         """
         Enables "packrat" parsing, which adds memoizing to the parsing logic.
         Repeated parse attempts at the same string location (which happens
@@ -1044,6 +1081,18 @@ class ParserElement(ABC):
           will limit the size of the packrat cache; if None is passed, then
           the cache size will be unbounded; if 0 is passed, the cache will
           be effectively disabled.
+        - per_thread - (default= ``False``) - if True, every thread gets its
+          own cache of ``cache_size_limit`` entries and its own
+          ``packrat_cache_stats``, and cache probes take no lock, so threads
+          parsing at the same time do not wait on each other; otherwise all
+          threads share one cache behind ``packrat_cache_lock``
+        - policy - (default= ``"fifo"``) - which entry a full cache evicts:
+          ``"fifo"`` the oldest, ``"lru"`` the least recently used, or
+          ``"2q"`` the 2Q policy, which keeps entries that are used more than
+          once from being flushed by a run of entries used only once; ignored
+          when the cache is unbounded. Every cache counts its hits and misses
+          in ``packrat_cache.counts`` over its whole life, so policies can be
+          compared across many parses
 
         This speedup may break existing programs that use parse actions that
         have side-effects.  For this reason, packrat parsing is disabled when
@@ -1061,6 +1110,12 @@ class ParserElement(ABC):
         thus the two cannot be used together. Use ``force=True`` to disable any
         previous, conflicting settings.
         """
+        if policy not in _packrat_policies:
+            raise ValueError(
+                "unknown packrat policy {!r}, expected one of {}".format(
+                    policy, ", ".join(_packrat_policies)
+                )
+            )
         if force:
             ParserElement.disable_memoization()
         elif ParserElement._left_recursion_enabled:
@@ -1068,10 +1123,18 @@ class ParserElement(ABC):
         if not ParserElement._packratEnabled:
             ParserElement._packratEnabled = True
             if cache_size_limit is None:
-                ParserElement.packrat_cache = _UnboundedCache()
+                factory = _UnboundedCache
+            else:
+                factory = partial(_packrat_policies[policy], cache_size_limit)
+            if per_thread:
+                ParserElement.packrat_cache = _ThreadLocalCache(
+                    factory, cache_size_limit
+                )
+                ParserElement.packrat_cache_stats = ParserElement.packrat_cache.stats
+                ParserElement._parse = ParserElement._parseCacheThreadLocal
             else:
-                ParserElement.packrat_cache = _FifoCache(cache_size_limit)
-            ParserElement._parse = ParserElement._parseCache
+                ParserElement.packrat_cache = factory()
+                ParserElement._parse = ParserElement._parseCache
 
     def parse_string(
         self, instring: str, parse_all: bool = False, *, parseAll: bool = False
@@ -1719,6 +1782,35 @@ class ParserElement(ABC):
         self.copyDefaultWhiteChars = copy_defaults
         return self
 
+    def set_results_class(
+        self, results_class: type, recursive: bool = True
+    ) -> "ParserElement":
+        """
+        Sets the :class:`ParseResults` type that this expression returns its
+        tokens in, such as :class:`CompactParseResults` for grammars that use
+        few or no results names.
+
+        :param recursive: If ``True`` (the default), also set it on all contained
+            expressions; each is visited once, so recursive grammars built with
+            :class:`Forward` are fine
+
+        Example::
+
+            term = Group(Word(alphas) + Opt(Word(nums), default="1"))
+            formula = term[1, ...].set_results_class(CompactParseResults)
+        """
+        pending = [self]
+        seen = set()
+        while pending:
+            expr = pending.pop()
+            if id(expr) in seen:
+                continue
+            seen.add(id(expr))
+            expr.resultsClass = results_class
+            if recursive:
+                pending.extend(expr.recurse())
+        return self
+
     def parse_with_tabs(self) -> "ParserElement":
         """
         Overrides default behavior to expand ``<TAB>`` s to spaces before parsing the input string.
@@ -2206,6 +2298,7 @@ class ParserElement(ABC):
     searchString = search_string
     transformString = transform_string
     setWhitespaceChars = set_whitespace_chars
+    setResultsClass = set_results_class
     parseWithTabs = parse_with_tabs
     setDebugActions = set_debug_actions
     setDebug = set_debug
@@ -4022,7 +4115,11 @@ class Or(ParseExpression):
 
         if maxException is not None:
             maxException.msg = self.errmsg
-            raise maxException
+            # likewise, clear the local as the exception leaves this frame
+            try:
+                raise maxException
+            finally:
+                maxException = None
         else:
             raise ParseException(
                 instring, loc, "no defined alternatives to match", self
@@ -4121,6 +4218,11 @@ class MatchFirst(ParseExpression):
                 pfe.parserElement = e
                 raise
             except ParseException as err:
+                # as in Or, the stored exception must not hold this frame
+                # through its traceback, or a later alternative that matches
+                # leaves the frame, and the tokens of the whole parse, in a
+                # reference cycle
+                err.__traceback__ = None
                 if err.loc > maxExcLoc:
                     maxException = err
                     maxExcLoc = err.loc
@@ -4133,7 +4235,11 @@ class MatchFirst(ParseExpression):
 
         if maxException is not None:
             maxException.msg = self.errmsg
-            raise maxException
+            # likewise, clear the local as the exception leaves this frame
+            try:
+                raise maxException
+            finally:
+                maxException = None
         else:
             raise ParseException(
                 instring, loc, "no defined alternatives to match", self
@@ -1,5 +1,6 @@
 # results.py
 from collections.abc import MutableMapping, Mapping, MutableSequence, Iterator
+from types import MappingProxyType
 import pprint
 from weakref import ref as wkref
 from typing import Tuple, Any
@@ -758,3 +759,87 @@ class ParseResults:
 
 MutableMapping.register(ParseResults)
 MutableSequence.register(ParseResults)
+
+
+class CompactParseResults(ParseResults):
+    """
+    A lighter :class:`ParseResults` for grammars that make little or no use
+    of results names. A plain :class:`ParseResults` allocates its own set
+    and dict of results names when it is created, which for a few tokens
+    takes more memory than the tokens themselves; instances of this class
+    share one empty set and one empty dict until a results name is first
+    assigned, and only then get their own. Everything else behaves as in
+    :class:`ParseResults`.
+
+    Select it for a grammar with :class:`ParserElement.set_results_class`::
+
+        integer = Word(nums).set_parse_action(lambda toks: int(toks[0]))
+        numbers = integer[1, ...].set_results_class(CompactParseResults)
+    """
+
+    __slots__ = ()
+
+    _no_names = frozenset()
+    _no_tokdict = MappingProxyType({})
+
+    def __new__(cls, toklist=None, name=None, **kwargs):
+        if isinstance(toklist, cls):
+            return toklist
+        self = object.__new__(cls)
+        self._name = None
+        self._parent = None
+        if isinstance(toklist, ParseResults):
+            # a plain ParseResults, such as one returned by a parse action,
+            # is copied into an instance of this class, so that __init__
+            # still runs and assigns the results name
+            self._name = toklist._name
+            self._all_names = set(toklist._all_names) or cls._no_names
+            self._toklist = toklist._toklist[:]
+            self._tokdict = dict(toklist._tokdict) or cls._no_tokdict
+            return self
+        self._all_names = cls._no_names
+
+        if toklist is None:
+            self._toklist = []
+        elif isinstance(toklist, (list, _generator_type)):
+            self._toklist = (
+                [toklist[:]]
+                if isinstance(toklist, ParseResults.List)
+                else list(toklist)
+            )
+        else:
+            self._toklist = [toklist]
+        self._tokdict = cls._no_tokdict
+        return self
+
+    def __setitem__(self, k, v, isinstance=isinstance):
+        if self._tokdict is self._no_tokdict and (
+            isinstance(v, _ParseResultsWithOffset) or not isinstance(k, (int, slice))
+        ):
+            self._tokdict = dict()
+        super().__setitem__(k, v)
+
+    def __delitem__(self, i):
+        if self._tokdict is self._no_tokdict and not isinstance(i, (int, slice)):
+            raise KeyError(i)
+        super().__delitem__(i)
+
+    def clear(self):
+        del self._toklist[:]
+        self._tokdict = self._no_tokdict
+
+    def __iadd__(self, other) -> "ParseResults":
+        if other._tokdict or other._all_names:
+            return super().__iadd__(other)
+        self._toklist += other._toklist
+        return self
+
+    def copy(self) -> "ParseResults":
+        ret = CompactParseResults(self._toklist)
+        if self._tokdict:
+            ret._tokdict = self._tokdict.copy()
+        if self._all_names:
+            ret._all_names = set(self._all_names)
+        ret._parent = self._parent
+        ret._name = self._name
+        return ret
@@ -3,6 +3,8 @@ import warnings
 import types
 import collections
 import itertools
+import threading
+import weakref
 from functools import lru_cache
 from typing import List, Union, Iterable
 
@@ -79,13 +81,20 @@ def line(loc: int, strg: str) -> str:
 
 
 class _UnboundedCache:
+    policy = "unbounded"
+
     def __init__(self):
         cache = {}
         cache_get = cache.get
         self.not_in_cache = not_in_cache = object()
+        # [hits, misses] over the life of the cache; unlike
+        # ParserElement.packrat_cache_stats these survive clear()
+        self.counts = counts = [0, 0]
 
         def get(_, key):
-            return cache_get(key, not_in_cache)
+            value = cache_get(key, not_in_cache)
+            counts[value is not_in_cache] += 1
+            return value
 
         def set_(_, key, value):
             cache[key] = value
@@ -100,13 +109,18 @@ class _UnboundedCache:
 
 
 class _FifoCache:
+    policy = "fifo"
+
     def __init__(self, size):
         self.not_in_cache = not_in_cache = object()
+        self.counts = counts = [0, 0]
         cache = collections.OrderedDict()
         cache_get = cache.get
 
         def get(_, key):
-            return cache_get(key, not_in_cache)
+            value = cache_get(key, not_in_cache)
+            counts[value is not_in_cache] += 1
+            return value
 
         def set_(_, key, value):
             cache[key] = value
@@ -122,6 +136,224 @@ class _FifoCache:
         self.clear = types.MethodType(clear, self)
 
 
+class _LRUCache:
+    """
+    Evicts the least recently used entry: a hit moves the entry to the end
+    of the order, so entries that keep being probed stay cached however long
+    ago they were added. All operations are O(1).
+    """
+
+    policy = "lru"
+
+    def __init__(self, size):
+        self.not_in_cache = not_in_cache = object()
+        self.counts = counts = [0, 0]
+        cache = collections.OrderedDict()
+        cache_get = cache.get
+        move_to_end = cache.move_to_end
+
+        def get(_, key):
+            value = cache_get(key, not_in_cache)
+            if value is not_in_cache:
+                counts[1] += 1
+            else:
+                counts[0] += 1
+                move_to_end(key)
+            return value
+
+        def set_(_, key, value):
+            cache[key] = value
+            move_to_end(key)
+            while len(cache) > size:
+                cache.popitem(last=False)
+
+        def clear(_):
+            cache.clear()
+
+        self.size = size
+        self.get = types.MethodType(get, self)
+        self.set = types.MethodType(set_, self)
+        self.clear = types.MethodType(clear, self)
+
+
+class _TwoQueueCache:
+    """
+    The 2Q policy (Johnson and Shasha, 1994): new entries go into a FIFO
+    queue holding a quarter of the entries, and keys evicted from it are
+    remembered, without their values, in a ghost queue. An entry only gets
+    into the main LRU queue when it is set again while its key is still a
+    ghost. Entries that are used once and never again are flushed by the
+    FIFO queue and never push anything out of the LRU queue. All operations
+    are O(1).
+    """
+
+    policy = "2q"
+
+    def __init__(self, size):
+        self.not_in_cache = not_in_cache = object()
+        self.counts = counts = [0, 0]
+        # the two queues together hold at most size entries, and none at
+        # all when size is 0 or less
+        size = max(size, 0)
+        recent_size = min(size, max(1, size // 4))
+        ghost_size = min(size, max(1, size // 2))
+        frequent_size = size - recent_size
+        recent = collections.OrderedDict()
+        ghosts = collections.OrderedDict()
+        frequent = collections.OrderedDict()
+
+        def get(_, key):
+            value = frequent.get(key, not_in_cache)
+            if value is not not_in_cache:
+                frequent.move_to_end(key)
+            else:
+                value = recent.get(key, not_in_cache)
+            counts[value is not_in_cache] += 1
+            return value
+
+        def set_(_, key, value):
+            if key in frequent:
+                frequent[key] = value
+                frequent.move_to_end(key)
+            elif key in ghosts:
+                del ghosts[key]
+                frequent[key] = value
+                while len(frequent) > frequent_size:
+                    frequent.popitem(last=False)
+            else:
+                recent[key] = value
+                while len(recent) > recent_size:
+                    evicted, _ = recent.popitem(last=False)
+                    ghosts[evicted] = None
+                    while len(ghosts) > ghost_size:
+                        ghosts.popitem(last=False)
+
+        def clear(_):
+            recent.clear()
+            ghosts.clear()
+            frequent.clear()
+
+        self.size = size
+        self.get = types.MethodType(get, self)
+        self.set = types.MethodType(set_, self)
+        self.clear = types.MethodType(clear, self)
+
+
+_packrat_policies = {
+    "fifo": _FifoCache,
+    "lru": _LRUCache,
+    "2q": _TwoQueueCache,
+}
+
+
+class _ThreadLocalCache:
+    """
+    One packrat cache per thread, each made by calling ``factory`` the first
+    time that thread uses it, with its own ``[hits, misses]`` counters.
+    ``local()`` returns the calling thread's cache and counters (also kept as
+    ``local_data.cache`` and ``local_data.stats`` once made), so a thread
+    can probe its cache without taking any lock; ``get``, ``set`` and
+    ``clear`` act on the calling thread's cache, and ``stats`` indexes the
+    calling thread's counters, so this can stand in for a single cache.
+    When a thread exits, its cache is emptied and dropped, and its lifetime
+    counts are added to those of the threads gone before it.
+    """
+
+    def __init__(self, factory, size):
+        self.not_in_cache = not_in_cache = object()
+        self.local_data = local_data = threading.local()
+        caches = set()
+        retired = [0, 0]
+        lock = threading.Lock()
+
+        def retire(cache):
+            with lock:
+                caches.discard(cache)
+                retired[0] += cache.counts[0]
+                retired[1] += cache.counts[1]
+            cache.clear()
+
+        def local(_):
+            try:
+                return local_data.cache, local_data.stats
+            except AttributeError:
+                cache = factory()
+                with lock:
+                    caches.add(cache)
+                # the token lives only in this thread's local data, so it
+                # goes, and retire() runs, as soon as the thread exits
+                local_data.token = token = _ThreadToken()
+                weakref.finalize(token, retire, cache)
+                local_data.cache, local_data.stats = cache, [0, 0]
+                return local_data.cache, local_data.stats
+
+        def get(self, key):
+            cache = self.local()[0]
+            value = cache.get(key)
+            return not_in_cache if value is cache.not_in_cache else value
+
+        def set_(self, key, value):
+            self.local()[0].set(key, value)
+
+        def clear(self):
+            cache, stats = self.local()
+            cache.clear()
+            stats[:] = [0, 0]
+
+        self.size = size
+        self.policy = factory().policy
+        self.caches = caches
+        self.retired = retired
+        self.lock = lock
+        self.local = types.MethodType(local, self)
+        self.get = types.MethodType(get, self)
+        self.set = types.MethodType(set_, self)
+        self.clear = types.MethodType(clear, self)
+        self.stats = _ThreadLocalStats(self)
+
+    @property
+    def counts(self):
+        # lifetime [hits, misses] of every thread's cache together
+        with self.lock:
+            hits = self.retired[0] + sum(cache.counts[0] for cache in self.caches)
+            misses = self.retired[1] + sum(cache.counts[1] for cache in self.caches)
+        return [hits, misses]
+
+
+class _ThreadToken:
+    """
+    Kept in one thread's local data by :class:`_ThreadLocalCache`, to be
+    notified (through ``weakref.finalize``) when that thread exits
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class _ThreadLocalStats:
+    """
+    The ``[hits, misses]`` counters of the calling thread's cache in a
+    :class:`_ThreadLocalCache`, indexable like the list they stand in for
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def __getitem__(self, index):
+        return self._cache.local()[1][index]
+
+    def __setitem__(self, index, value):
+        self._cache.local()[1][index] = value
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        return iter(self._cache.local()[1])
+
+    def __repr__(self):
+        return repr(self._cache.local()[1])
+
+
 class LRUMemo:
     """
     A memoizing mapping that retains `capacity` deleted items
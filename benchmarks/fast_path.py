@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Checks that scanFormula and the pyparsing FormulaParser agree on a large
+# generated corpus of formulas, then compares their per-formula latency.
+#
+# Run against the built zipapp:  python3 benchmarks/fast_path.py [./element] [count]
+
+import os
+import random
+import runpy
+import sys
+import timeit
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+import element
+from pyparsing import ParseException
+
+symbols=["H","He","C","N","O","Na","Cl","Fe","Uuo","X"]
+
+def term(rng,depth):
+	if depth<3 and rng.random()<0.2:
+		text="("+formula(rng,depth+1)+")"
+	else:
+		text=rng.choice(symbols)
+	if rng.random()<0.6:
+		text+=str(rng.randint(0,120))
+	return text
+
+def formula(rng,depth=0):
+	return "".join(term(rng,depth) for _ in range(rng.randint(1,6)))
+
+def corpus(count,seed=0):
+	# mostly plain formulas, plus some the scanner must hand to pyparsing
+	rng=random.Random(seed)
+	for _ in range(count):
+		text=formula(rng)
+		roll=rng.random()
+		if roll<0.05:
+			position=rng.randrange(len(text)+1)
+			text=text[:position]+rng.choice(" ()2!a")+text[position:]
+		elif roll<0.08:
+			text=rng.choice(["","(",")","()","2H","h2o"," H2O","H2O "])
+		yield text
+
+def grammar(text):
+	try:
+		return [list(pair) for pair in element.FormulaParser.parse(text)]
+	except ParseException:
+		return None
+
+def compound(text):
+	try:
+		return [list(pair) for pair in element.parseCompound(text)]
+	except ParseException:
+		return None
+
+def check(count):
+	fast=0
+	for text in corpus(count):
+		expected=grammar(text)
+		scanned=element.scanFormula(text)
+		if scanned is not None:
+			fast+=1
+			assert scanned==expected,(text,scanned,expected)
+		assert compound(text)==expected,(text,compound(text),expected)
+	print("%d formulas agree, %d took the fast path"%(count,fast))
+
+def report(name,func,formulas,number=20):
+	best=min(timeit.repeat(lambda:[func(text) for text in formulas],number=number,repeat=5))
+	print("%-10s %9.2f us/formula"%(name,best/number/len(formulas)*1e6))
+
+if __name__=="__main__":
+	check(int(sys.argv[2]) if len(sys.argv)>2 else 20000)
+	formulas=[text for text in corpus(1000) if element.scanFormula(text) is not None]
+	report("pyparsing",element.FormulaParser.parse,formulas)
+	report("scanner",element.scanFormula,formulas)
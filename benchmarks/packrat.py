@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Per-formula latency of the pyparsing formula grammar with and without
+# packrat memoisation (--packrat), on flat and deeply nested formulas, with
+# the packrat hits and misses each formula produced; then the same formulas
+# parsed from several threads at once, with one packrat cache shared behind
+# pyparsing's lock and with a cache per thread.
+#
+# Run against the built zipapp:  python3 benchmarks/packrat.py [./element]
+
+import os
+import runpy
+import sys
+import threading
+import time
+import timeit
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+import element
+from pyparsing import ParserElement
+
+def nested(depth):
+	text="CH2"
+	for multiplier in range(3,depth+3):
+		text="(%s)%d"%(text,multiplier)
+	return text
+
+formulas=["H2O","C6H12O6","K4(ON(SO3)2)2",nested(5),nested(10),nested(20),"CH3"+"CH2"*100+"CH3"]
+
+def threaded(threads,number=50):
+	# us per parse, all threads parsing every formula number times
+	def work():
+		for _ in range(number):
+			for formula in formulas[:-1]:
+				element.FormulaParser.parse(formula)
+	workers=[threading.Thread(target=work) for _ in range(threads)]
+	start=time.perf_counter()
+	for worker in workers:
+		worker.start()
+	for worker in workers:
+		worker.join()
+	return (time.perf_counter()-start)/(threads*number*(len(formulas)-1))*1e6
+
+def timing(formula,number=200):
+	return min(timeit.repeat(lambda:element.FormulaParser.parse(formula),number=number,repeat=5))/number*1e6
+
+if __name__=="__main__":
+	plain=[timing(formula) for formula in formulas]
+	element.FormulaParser.enablePackrat()
+	print("%-32s %10s %10s %8s %8s"%("formula","plain us","packrat us","hits","misses"))
+	for formula,before in zip(formulas,plain):
+		after=timing(formula)
+		element.FormulaParser.parse(formula)
+		hits,misses=ParserElement.packrat_cache_stats
+		print("%-32s %10.1f %10.1f %8d %8d"%(formula if len(formula)<=32 else formula[:29]+"...",before,after,hits,misses))
+
+	print()
+	print("%-8s %14s %14s"%("threads","shared us","per-thread us"))
+	size=element.FormulaParser.packratSize
+	for threads in (1,2,4,8):
+		ParserElement.enable_packrat(size,force=True)
+		shared=threaded(threads)
+		ParserElement.enable_packrat(size,force=True,per_thread=True)
+		print("%-8d %14.1f %14.1f"%(threads,shared,threaded(threads)))
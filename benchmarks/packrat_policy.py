@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Packrat hit rates and parse times of each eviction policy (fifo, lru, 2q)
+# at several cache sizes, on long formulas through the formula grammar and,
+# as a control that does backtrack, on arithmetic through a grammar whose
+# alternatives share a prefix. The counts are the caches' lifetime
+# counters, since pyparsing resets packrat_cache_stats on every parse.
+#
+# Run against the built zipapp:  python3 benchmarks/packrat_policy.py [./element]
+
+import os
+import random
+import runpy
+import sys
+import time
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+import element
+from pyparsing import ParserElement, Forward, Word, Group, Suppress, nums
+
+policies=["fifo","lru","2q"]
+sizes=[32,128,512,None]
+
+formulas=[
+	"CH3"+"CH2"*100+"CH3",
+	"NH2"+"CH2CONH"*50+"CH2COOH",
+	"".join("(C2H4O)%d"%count for count in range(1,60)),
+	"K4(ON(SO3)2)2"*20,
+]
+
+def arithmetic():
+	expression=Forward()
+	term=Forward()
+	factor=Word(nums)|Group(Suppress("(")+expression+Suppress(")"))
+	term<<=factor+"*"+term|factor+"/"+term|factor
+	expression<<=term+"+"+expression|term+"-"+expression|term
+	return expression
+
+def sums(count=30,seed=0):
+	rng=random.Random(seed)
+	def generate(depth):
+		if depth>4 or rng.random()<0.3:
+			return str(rng.randint(1,99))
+		return "("+generate(depth+1)+rng.choice("+-*/")+generate(depth+1)+")"+rng.choice("+-*/")+generate(depth+1)
+	return [generate(0) for _ in range(count)]
+
+def compare(name,parse,corpus):
+	print("%-8s %6s %-6s %9s %9s %7s %9s"%(name,"size","policy","hits","misses","rate","ms"))
+	for size in sizes:
+		for policy in policies:
+			ParserElement.enable_packrat(size,force=True,policy=policy)
+			start=time.perf_counter()
+			for text in corpus:
+				parse(text)
+			elapsed=time.perf_counter()-start
+			hits,misses=ParserElement.packrat_cache.counts
+			print("%-8s %6s %-6s %9d %9d %6.1f%% %9.1f"%(name,size,policy if size else "-",hits,misses,100*hits/(hits+misses),elapsed*1e3))
+			if size is None:
+				break
+	print()
+
+if __name__=="__main__":
+	compare("formula",element.FormulaParser.grammar().parseString,formulas*5)
+	expression=arithmetic()
+	compare("control",lambda text:expression.parseString(text,parseAll=True),sums())
+	ParserElement.disable_memoization()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# Per-formula latency of parseCompound, rebuilding the grammar on every call
+# (the old behaviour) versus reusing the shared FormulaParser grammar.
+#
+# Run against the built zipapp:  python3 benchmarks/parse_compound.py [./element]
+
+import os
+import runpy
+import sys
+import timeit
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+import element
+
+formulas=["H2O","NaCl","C6H12O6","Ca(OH)2","K4(ON(SO3)2)2","CH3(CH2)16COOH"]
+
+def rebuilt():
+	for formula in formulas:
+		element.FormulaParser.build().parseString(formula)
+
+def cached():
+	for formula in formulas:
+		element.FormulaParser.parse(formula)
+
+def report(name,func,number):
+	best=min(timeit.repeat(func,number=number,repeat=5))
+	print("%-10s %9.1f us/formula"%(name,best/number/len(formulas)*1e6))
+
+if __name__=="__main__":
+	report("rebuilt",rebuilt,200)
+	report("cached",cached,2000)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Memory per parsed formula through the pyparsing formula grammar, with its
+# results in plain ParseResults and in CompactParseResults (the grammar's
+# default). For each formula: the bytes its result keeps alive and the peak
+# bytes allocated while parsing it, measured with tracemalloc, and the number
+# of objects a parse leaves behind in reference cycles for the garbage
+# collector.
+#
+# Run against the built zipapp:  python3 benchmarks/parse_memory.py [./element]
+
+import gc
+import os
+import runpy
+import sys
+import tracemalloc
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+import element
+from pyparsing import ParseResults, CompactParseResults
+
+def nested(depth):
+	text="CH2"
+	for multiplier in range(3,depth+3):
+		text="(%s)%d"%(text,multiplier)
+	return text
+
+formulas=["H2O","C6H12O6","C8H10N4O2","K4(ON(SO3)2)2",nested(5),nested(20),"CH3"+"CH2"*100+"CH3","".join("(C2H4O)%d"%count for count in range(1,30))]
+
+def measure(grammar,formula):
+	# (retained bytes, peak bytes, objects in cycles) of one parse
+	grammar.parseString(formula)
+	gc.collect()
+	gc.disable()
+	try:
+		tracemalloc.start()
+		result=grammar.parseString(formula)
+		peak=tracemalloc.get_traced_memory()[1]
+		cyclic=gc.collect()
+		retained=tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+	finally:
+		gc.enable()
+	del result
+	return retained,peak,cyclic
+
+def grammar(results):
+	formula=element.FormulaParser.build()
+	formula.setResultsClass(results)
+	return formula
+
+if __name__=="__main__":
+	grammars={"plain":grammar(ParseResults),"compact":grammar(CompactParseResults)}
+	print("%-32s %-8s %10s %10s %10s"%("formula","results","retained","peak","cycles"))
+	totals={name:[0,0,0] for name in grammars}
+	for formula in formulas:
+		for name,formulaGrammar in grammars.items():
+			sizes=measure(formulaGrammar,formula)
+			totals[name]=[total+size for total,size in zip(totals[name],sizes)]
+			print("%-32s %-8s %10d %10d %10d"%(formula if len(formula)<=32 else formula[:29]+"...",name,*sizes))
+	print()
+	for name,sizes in totals.items():
+		print("%-32s %-8s %10d %10d %10d"%("mean per formula",name,*(size//len(formulas) for size in sizes)))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Throughput and memory of --scan on generated lab-notebook text of several
+# sizes, with a formula every ten words or so: MB/s, formulas found and the
+# peak of Python allocations while scanning, measured with tracemalloc in a
+# second pass since tracing slows the scan down. The peak should stay the
+# same however large the file is, as the file is memory-mapped and read a
+# chunk at a time.
+#
+# Run against the built zipapp:  python3 benchmarks/scan.py [./element] [MB ...]
+
+import os
+import random
+import runpy
+import sys
+import tempfile
+import time
+import tracemalloc
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+runpy.run_path(os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element"),run_name="element_app")
+
+from element import scan
+
+words=("the sample was dissolved in and then heated to for h with stirring after which "
+	"filtered washed dried under vacuum at The yield was percent of a white solid "
+	"I In As He added mL g mmol NMR IR UV Fig Table see Ref").split()
+formulas=["H2O","NaCl","CO2","H2SO4","(NH4)2SO4","Ca(OH)2","KMnO4","C6H12O6","CH3COOH","Fe2(SO4)3","CuSO4","NaHCO3","MgCl2","K4(ON(SO3)2)2"]
+
+def notebook(path,megabytes,seed=0):
+	# prose with a formula every ten words or so and a number now and then
+	rng=random.Random(seed)
+	with open(path,"w") as target:
+		written=0
+		while written<megabytes<<20:
+			line=" ".join(rng.choice(formulas) if rng.random()<0.1 else str(rng.randint(1,500)) if rng.random()<0.05 else rng.choice(words) for _ in range(16))+".\n"
+			written+=target.write(line)
+
+def count(path):
+	with open(path,"rb") as file:
+		return sum(1 for _ in scan.scan(file))
+
+def measure(path):
+	# (seconds, formulas, peak bytes) of scanning path
+	start=time.perf_counter()
+	found=count(path)
+	elapsed=time.perf_counter()-start
+	tracemalloc.start()
+	count(path)
+	peak=tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return elapsed,found,peak
+
+if __name__=="__main__":
+	sizes=[int(size) for size in sys.argv[2:]] or [1,4,16]
+	scan.scanGrammar()
+	print("%8s %10s %10s %12s"%("MB","MB/s","formulas","peak bytes"))
+	with tempfile.TemporaryDirectory() as directory:
+		for megabytes in sizes:
+			path=os.path.join(directory,"notebook.txt")
+			notebook(path,megabytes)
+			elapsed,found,peak=measure(path)
+			print("%8d %10.2f %10d %12d"%(megabytes,os.path.getsize(path)/elapsed/(1<<20),found,peak))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Cold-start check for single-element lookups: runs `./element iron` under
+# `python -X importtime` and fails if a lazily loaded module was imported or
+# the import of the element package went over budget. It then starts a
+# --serve instance and checks that the --connect client, for an element and
+# for a compound, loads none of those modules either.
+#
+# Usage:  python3 benchmarks/startup.py [./element] [budget in ms]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules only the compound, REPL, batch or server paths should load
+lazy=["pyparsing","decimal","readline","csv","concurrent.futures","asyncio"]
+
+def importtimes(app,*args):
+	# module -> cumulative import time in microseconds
+	process=subprocess.run([sys.executable,"-X","importtime",app,*args],capture_output=True,text=True,check=True)
+	times={}
+	for line in process.stderr.splitlines():
+		if not line.startswith("import time:") or "|" not in line:
+			continue
+		_,cumulative,name=line[len("import time:"):].split("|")
+		if cumulative.strip().isdigit():
+			times[name.strip()]=int(cumulative)
+	return times
+
+if __name__=="__main__":
+	app=os.path.abspath(sys.argv[1]) if len(sys.argv)>1 else os.path.join(root,"element")
+	budget=float(sys.argv[2]) if len(sys.argv)>2 else 50
+
+	# best of a few runs, to keep scheduling noise out of the number
+	runs=[importtimes(app,"iron") for _ in range(5)]
+	loaded=[name for name in lazy if any(name in times for times in runs)]
+	elapsed=min(times.get("element",0) for times in runs)/1000
+
+	print("element imported in %.1f ms (budget %.1f ms)"%(elapsed,budget))
+	if loaded:
+		print("loaded lazily imported modules: "+", ".join(loaded))
+
+	with tempfile.TemporaryDirectory() as directory:
+		socket=os.path.join(directory,"element.sock")
+		server=subprocess.Popen([sys.executable,app,"--serve",socket])
+		try:
+			while not os.path.exists(socket):
+				time.sleep(0.01)
+			runs=[importtimes(app,"--connect",socket,Input) for Input in ("iron","H2O")]
+		finally:
+			server.terminate()
+			server.wait()
+	connected=[name for name in lazy if any(name in times for times in runs)]
+	if connected:
+		print("--connect loaded lazily imported modules: "+", ".join(connected))
+	if loaded or connected or elapsed>budget:
+		sys.exit(1)
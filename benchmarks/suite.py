@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Regression benchmarks for every stage of answering a query: element lookup
+# (parseElement), formula parsing (parseCompound), result building
+# (getResult) and rendering (parseInput). Each stage runs over fixed
+# corpora (element symbols, simple formulas, deeply nested parentheses and
+# long polymers) and reports ops/sec with p50/p90/p99 latencies.
+#
+# Run against the built zipapp:
+#
+#     python3 benchmarks/suite.py [--app ./element] [--save baseline.json]
+#     python3 benchmarks/suite.py --compare baseline.json [--threshold 10]
+#
+# --save writes the results as a JSON baseline; --compare reruns, prints the
+# change of every stage against a baseline and exits with status 1 if any
+# stage lost more than --threshold percent of its ops/sec.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import sys
+import time
+
+root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def symbolCorpus():
+	return [symbol.strip() for symbol in element.pt.column("Symbol")]
+
+def simpleCorpus(count=200,seed=0):
+	common=["H","C","N","O","Na","Mg","Al","Si","P","S","Cl","K","Ca","Fe","Cu","Zn","Br","I"]
+	rng=random.Random(seed)
+	formulas=["H2O","NaCl","CO2","C6H12O6","H2SO4","CH3COOH","C8H10N4O2","KMnO4","Fe2O3","Ca(OH)2"]
+	while len(formulas)<count:
+		formulas.append("".join(symbol+str(rng.randint(1,12)) for symbol in rng.sample(common,rng.randint(2,5))))
+	return formulas
+
+def nestedCorpus(depth=8):
+	# ((((CH3)2)3)4)5 and its shallower and deeper relatives
+	formulas=[]
+	for levels in range(1,depth+1):
+		text="CH3"
+		for multiplier in range(2,levels+2):
+			text="(%s)%d"%(text,multiplier)
+		formulas.append(text)
+		formulas.append("C2H5"+text+"OH")
+	return formulas
+
+def polymerCorpus():
+	# long flat and repeated-unit chains, a few thousand characters each
+	return [
+		"CH3"+"CH2"*500+"CH3",
+		"C8H8"*250,
+		"NH2"+"CH2CONH"*200+"CH2COOH",
+		"CH3("+"CH2"*100+")10CH3",
+		"".join("(C2H4O)%d"%count for count in range(1,200)),
+	]
+
+def corpora():
+	return {
+		"symbols":symbolCorpus(),
+		"simple":simpleCorpus(),
+		"nested":nestedCorpus(),
+		"polymer":polymerCorpus(),
+	}
+
+def stages(inputs):
+	# name -> (function, arguments); every call is one op
+	stages={"lookup/symbols":(element.parseElement,inputs["symbols"])}
+	for name in ("simple","nested","polymer"):
+		stages["parse/"+name]=(element.parseCompound,inputs[name])
+	stages["result/element"]=(element.getResult,[element.parseElement(symbol) for symbol in inputs["symbols"]])
+	for name in ("simple","nested","polymer"):
+		stages["result/"+name]=(element.getResult,[element.parseCompound(text) for text in inputs[name]])
+	mixed=[symbol.lower() for symbol in inputs["symbols"]]+inputs["simple"]+inputs["nested"]
+	for fmt in (None,"jsonl","csv"):
+		stages["render/%s"%(fmt or "pprint")]=(lambda text,fmt=fmt:element.parseInput(text,fmt),mixed)
+	return stages
+
+def measure(func,arguments,rounds,loops):
+	# per-op latencies in seconds, a list per round with one sample per
+	# argument, each the mean of loops calls so timer overhead stays out of
+	# fast stages
+	samples=[]
+	clock=time.perf_counter
+	with contextlib.redirect_stdout(io.StringIO()) as sink:
+		for _ in range(rounds):
+			samples.append([])
+			for argument in arguments:
+				start=clock()
+				for _ in range(loops):
+					func(argument)
+				samples[-1].append((clock()-start)/loops)
+			sink.seek(0)
+			sink.truncate()
+	return samples
+
+def percentile(ordered,fraction):
+	return ordered[min(len(ordered)-1,int(fraction*len(ordered)))]
+
+def summarise(samples):
+	# ops/s is taken from the fastest round, like timeit's best of several,
+	# so that noise from other processes does not read as a regression; the
+	# percentiles are over every sample
+	ordered=sorted(sample for timings in samples for sample in timings)
+	return {
+		"ops/s":max(len(timings)/sum(timings) for timings in samples),
+		"p50 (us)":percentile(ordered,0.5)*1e6,
+		"p90 (us)":percentile(ordered,0.9)*1e6,
+		"p99 (us)":percentile(ordered,0.99)*1e6,
+	}
+
+def run(rounds,loops):
+	inputs=corpora()
+	results={}
+	for name,(func,arguments) in stages(inputs).items():
+		# one untimed pass so first-use costs (grammar, mass table) are not
+		# charged to whichever stage happens to run first
+		measure(func,arguments,1,1)
+		results[name]=summarise(measure(func,arguments,rounds,loops))
+		print("%-16s %12.0f ops/s   p50 %9.2f us   p90 %9.2f us   p99 %9.2f us"%(
+			name,results[name]["ops/s"],results[name]["p50 (us)"],results[name]["p90 (us)"],results[name]["p99 (us)"]))
+	return {
+		"python":platform.python_version(),
+		"machine":platform.machine(),
+		"corpora":{name:len(texts) for name,texts in inputs.items()},
+		"stages":results,
+	}
+
+def compare(current,baseline,threshold):
+	# prints the change of every stage and returns the names of those that
+	# slowed down by more than threshold percent
+	regressions=[]
+	for name,result in current["stages"].items():
+		if name not in baseline["stages"]:
+			print("%-16s %12s"%(name,"new"))
+			continue
+		change=(result["ops/s"]/baseline["stages"][name]["ops/s"]-1)*100
+		flag=""
+		if change<-threshold:
+			regressions.append(name)
+			flag="  REGRESSION"
+		print("%-16s %+11.1f%%   %12.0f -> %12.0f ops/s%s"%(name,change,baseline["stages"][name]["ops/s"],result["ops/s"],flag))
+	return regressions
+
+if __name__=="__main__":
+	parser=argparse.ArgumentParser()
+	parser.add_argument("--app",default=os.path.join(root,"element"),help="zipapp to benchmark (default: ./element)")
+	parser.add_argument("--rounds",type=int,default=5,help="passes over every corpus (default: 5)")
+	parser.add_argument("--loops",type=int,default=20,help="calls per timed sample (default: 20)")
+	parser.add_argument("--save",metavar="FILE",help="write the results to FILE as a JSON baseline")
+	parser.add_argument("--compare",metavar="FILE",help="compare against the JSON baseline in FILE")
+	parser.add_argument("--threshold",type=float,default=10,help="percent drop in ops/s counted as a regression (default: 10)")
+	args=parser.parse_args()
+
+	runpy.run_path(os.path.abspath(args.app),run_name="element_app")
+	import element
+
+	current=run(args.rounds,args.loops)
+	if args.save:
+		with open(args.save,"w") as target:
+			json.dump(current,target,indent="\t")
+	if args.compare:
+		with open(args.compare,"r") as source:
+			baseline=json.load(source)
+		regressions=compare(current,baseline,args.threshold)
+		if regressions:
+			print("%d of %d stages regressed by more than %g%%: %s"%(len(regressions),len(current["stages"]),args.threshold,", ".join(regressions)))
+			sys.exit(1)
@@ -0,0 +1,9 @@
+import os, sys
+zip_path=os.path.dirname(__file__)
+
+sys.path.insert(0,os.path.join(zip_path,"_vendor"))
+
+import element
+
+if __name__=="__main__":
+    element.main()
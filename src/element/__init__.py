@@ -1,32 +1,60 @@
 #!/usr/bin/env python3
 
 
-from pyparsing import (Suppress, Word, nums, alphas, Regex, Forward, Group, 
-						Optional, OneOrMore, ParseResults)
+# pyparsing, decimal, readline and the other heavier modules are imported
+# where they are used, so looking up a single element does not load them
 
+import os
+from .database import Database
 
-from collections import defaultdict
+# data files shipped alongside this module are read through the package's
+# own loader (zipimport inside the zipapp), once each
+resources={}
 
-import os
-pt=open(os.path.join(__file__,"..","elements.json"),"r").read()
-table=open(os.path.join(__file__,"..","table.txt"),"r").read().decode()
+def readResource(name):
+	try:
+		return resources[name]
+	except KeyError:
+		data=resources[name]=__loader__.get_data(os.path.join(os.path.dirname(__file__),name))
+		return data
 
+pt=Database(readResource("elements.bin"))
+table=readResource("table.txt").decode()
 
-import json
-import readline
-from pprint import pprint
-import copy
+
+import argparse
+import collections
+import io
+import itertools
 import sys
-import math
-from decimal import Decimal
-pt=json.loads(pt)
+import threading
+
+# symbol -> atomic mass as a Decimal, built on first use; repr() of the
+# stored float gives back exactly the digits written in elements.json
+masses=None
+
+def massTable():
+	global masses
+	if masses is None:
+		from decimal import Decimal
+		masses={symbol:Decimal(repr(mass)) for symbol,mass in zip(pt.column("Symbol"),pt.column("AtomicMass"))}
+	return masses
 
-elements=list(map(str.lower, list(pt.keys())))
+# every spelling an element can be looked up by (name, symbol and atomic
+# number, case-folded) maps to its key in pt
+index={}
+for name,symbol,number in zip(pt,pt.column("Symbol"),pt.column("AtomicNumber")):
+	index[name.casefold()]=name
+	index[symbol.casefold()]=name
+	index[str(number)]=name
 
-symbols=[pt[_]["Symbol"].lower() for _ in list(pt.keys())]
+error="Incorrect Element/Molecule"
 
 keepnames=["Symbol","Protons","Electrons","Neutrons", "Period", "Group", "Electronic configuration","Atomic mass", "Atomic number", "Atomic radius", "Density (g/cm^3)", "Specific heat (J/K)", "Electronegativity", "Melting point (K)", "Boiling point (K)", "First ionization (eV)"]
 
+# columns of the csv/tsv output, shared by elements, compounds and errors
+fields=["Name"]+keepnames+["Compound","Molar Mass","Error"]
+
 keepkeys=["Symbol","NumberofProtons","NumberofElectrons","NumberofNeutrons","Period","Group","ElectronicConfiguration", "AtomicMass","AtomicNumber","AtomicRadius","Density","SpecificHeat","Electronegativity","MeltingPoint","BoilingPoint","FirstIonization"]
 
 def getResult(Element):
@@ -42,102 +70,476 @@ def getResult(Element):
 	else:
 		result={}
 		result['Compound']=''.join([str(_[0])+str(_[1]) for _ in Element])
-		result['Molar Mass']=float(sum([Decimal(_[1]*float(getResult(parseElement(_[0]))['Atomic mass'])) for _ in Element]))
+		result['Molar Mass']=float(molarMass(Element))
 	return result
 	
 
+def molarMass(counts):
+	mass=massTable()
+	total=0
+	for symbol,count in counts:
+		try:
+			total+=mass[symbol]*count
+		except KeyError:
+			# a term can also be an element's name ("Iron", "HydrogenOxygen2"),
+			# which goes through the index to its symbol
+			total+=mass[pt[lookupElement(symbol)]["Symbol"].strip()]*count
+	return total
+
+def lookupElement(key):
+	return index[str(key).casefold()]
+
 def parseElement(Input):
-	if Input.lower() in elements:
-		return Input.title()
-	elif Input.lower() in symbols:
-		return elements[symbols.index(Input.lower())].title()
-	else:
-		raise Exception
+	return lookupElement(Input)
 
-def parseCompound(Input):
-	LPAR,RPAR = map(Suppress,"()")
-	integer = Word(nums)
+class FormulaParser:
+	# the grammar is built on first use and shared by every caller; parse
+	# actions keep no state between calls, so one grammar can serve any
+	# number of threads
+	_formula=None
+	_lock=threading.Lock()
+	# packrat memoisation (off unless enablePackrat() is called, then the
+	# name of the cache's eviction policy); pyparsing
+	# empties the packrat cache at the start of every parse, so it only ever
+	# holds the entries of one formula and its size is only an upper bound.
+	# It is set up once, before the first parse, so no thread ever has its
+	# cache replaced in the middle of a parse. Every thread gets a cache of
+	# its own, so threads parsing at once do not queue on pyparsing's cache
+	# lock. Hits and misses are added up here because pyparsing's own
+	# counters are reset with the cache.
+	packrat=False
+	packratSize=0
+	packratLimit=1<<16
+	packratStats=[0,0]
 	
-	# add parse action to convert integers to ints, to support doing addition 
-	# and multiplication at parse time
-	integer.setParseAction(lambda t:int(t[0]))
+	@staticmethod
+	def build(strict=False):
+		# strict builds the grammar for formulas in running text: element
+		# symbols are only those in the table, and no part of a formula may
+		# be separated by whitespace
+		from pyparsing import (Suppress, Word, nums, alphas, Regex, Forward, Group, 
+								Optional, OneOrMore, ParseResults, CompactParseResults)
+		
+		LPAR,RPAR = map(Suppress,"()")
+		integer = Word(nums)
+		
+		# add parse action to convert integers to ints, to support doing addition 
+		# and multiplication at parse time
+		integer.setParseAction(lambda t:int(t[0]))
+		
+		element = Word(alphas.upper(), alphas.lower())
+		# or, to be more specific, a Regex of the symbols in the table (the
+		# longer ones first, so that Co is not read as C)
+		if strict:
+			element = Regex("|".join(sorted(massTable(), key=len, reverse=True)))
+		
+		# forward declare 'formula' so it can be used in definition of 'term'
+		formula = Forward()
+		
+		# a term is [element, count] or [[subgroup terms], multiplier]; the
+		# grammar uses no results names, so its results can all be
+		# CompactParseResults, which skip the per-result name set and dict
+		term = Group((element | Group(LPAR + formula + RPAR)) + 
+						Optional(integer, default=1))
+		
+		# define contents of a formula as one or more terms
+		formula << OneOrMore(term)
+		
+		
+		# add parse actions for parse-time processing
+		
+		# parse action to multiply out subgroups
+		def multiplyContents(tokens):
+			t = tokens[0]
+			# if these tokens contain a subgroup, then use multiplier to
+			# extend counts of all elements in the subgroup
+			# (new pairs, of the grammar's results class, rather than
+			# multiplying in place, so results kept in the packrat cache are
+			# never changed after the fact)
+			if isinstance(t[0], ParseResults):
+				mult = t[1]
+				results = type(tokens)
+				return results([results([term[0], term[1]*mult]) for term in t[0]])
+		term.setParseAction(multiplyContents)
+		
+		# add parse action to sum up multiple references to the same element
+		def sumByElement(tokens):
+			elementsList = [t[0] for t in tokens]
+		
+			# construct set to see if there are duplicates
+			duplicates = len(elementsList) > len(set(elementsList))
+		
+			# if there are duplicate element names, sum up by element and
+			# return a new nested ParseResults
+			if duplicates:
+				ctr = collections.defaultdict(int)
+				for t in tokens:
+					ctr[t[0]] += t[1]
+				results = type(tokens)
+				return results([results([k,v]) for k,v in ctr.items()])
+		formula.setParseAction(sumByElement)
+		if strict:
+			# the Forward does not pass leave_whitespace on to what it holds
+			formula.leave_whitespace()
+			formula.expr.leave_whitespace()
+		formula.setResultsClass(CompactParseResults)
+		formula.streamline()
+		return formula
 	
-	element = Word(alphas.upper(), alphas.lower())
-	# or if you want to be more specific, use this Regex
-	# element = Regex(r"A[cglmrstu]|B[aehikr]?|C[adeflmorsu]?|D[bsy]|E[rsu]|F[emr]?|"
-	#                 "G[ade]|H[efgos]?|I[nr]?|Kr?|L[airu]|M[dgnot]|N[abdeiop]?|"
-	#                 "Os?|P[abdmortu]?|R[abefghnu]|S[bcegimnr]?|T[abcehilm]|"
-	#                 "Uu[bhopqst]|U|V|W|Xe|Yb?|Z[nr]")
+	@classmethod
+	def grammar(cls):
+		if cls._formula is None:
+			with cls._lock:
+				if cls._formula is None:
+					cls._formula=cls.build()
+		return cls._formula
 	
-	# forward declare 'formula' so it can be used in definition of 'term'
-	formula = Forward()
+	@classmethod
+	def enablePackrat(cls,policy="lru"):
+		cls.packrat=policy
 	
-	term = Group((element | Group(LPAR + formula + RPAR)("subgroup")) + 
-					Optional(integer, default=1)("mult"))
+	@classmethod
+	def startPackrat(cls):
+		if not cls.packratSize:
+			with cls._lock:
+				if not cls.packratSize:
+					from pyparsing import ParserElement
+					ParserElement.enable_packrat(cls.packratLimit,force=True,per_thread=True,policy=cls.packrat)
+					cls.packratSize=cls.packratLimit
 	
-	# define contents of a formula as one or more terms
-	formula << OneOrMore(term)
+	@classmethod
+	def parse(cls,Input):
+		formula=cls.grammar()
+		if not cls.packrat:
+			return formula.parseString(Input)
+		from pyparsing import ParserElement
+		cls.startPackrat()
+		try:
+			return formula.parseString(Input)
+		finally:
+			hits,misses=ParserElement.packrat_cache_stats
+			with cls._lock:
+				cls.packratStats[0]+=hits
+				cls.packratStats[1]+=misses
 	
+	@classmethod
+	def stats(cls):
+		return "packrat (%s): %d hits, %d misses, size %d"%(cls.packrat,cls.packratStats[0],cls.packratStats[1],cls.packratSize)
+
+def scanFormula(Input):
+	# single pass over plain formulas (symbols, counts and nested parentheses,
+	# nothing else); gives the same [symbol, count] pairs as FormulaParser, or
+	# None for anything it does not handle so the grammar can have a go
+	stack=[{}]
+	i=0
+	n=len(Input)
+	while i<n:
+		c=Input[i]
+		if "A"<=c<="Z":
+			j=i+1
+			while j<n and "a"<=Input[j]<="z":
+				j+=1
+			counts={Input[i:j]:1}
+		elif c=="(":
+			stack.append({})
+			i+=1
+			continue
+		elif c==")" and len(stack)>1 and stack[-1]:
+			counts=stack.pop()
+			j=i+1
+		else:
+			return None
+		i=j
+		while j<n and "0"<=Input[j]<="9":
+			j+=1
+		mult=int(Input[i:j]) if j>i else 1
+		i=j
+		level=stack[-1]
+		for symbol,count in counts.items():
+			level[symbol]=level.get(symbol,0)+count*mult
+	if len(stack)>1 or not stack[0]:
+		return None
+	return [[symbol,count] for symbol,count in stack[0].items()]
+
+def parseCompound(Input):
+	result=scanFormula(Input)
+	if result is None:
+		result=FormulaParser.parse(Input)
+	return result
+
+def evaluate(Input):
+	if Input.islower() or Input.isdigit():
+		return getResult(parseElement(Input))
+	else:
+		return getResult(parseCompound(Input))
+
+def formatter(fmt,columns=fields):
+	# returns the header line for fmt (or None) and a function rendering one
+	# result as a single line; csv/tsv columns follow keepnames unless given
+	if fmt=="jsonl":
+		import json
+		return None,json.JSONEncoder(ensure_ascii=False,separators=(",",":")).encode
+	elif fmt in ("csv","tsv"):
+		import csv
+		buffer=io.StringIO()
+		writer=csv.writer(buffer,delimiter="," if fmt=="csv" else "\t",lineterminator="")
+		def format(row):
+			buffer.seek(0)
+			buffer.truncate()
+			writer.writerow(row)
+			return buffer.getvalue()
+		return format(columns),lambda result:format([result.get(column) for column in columns])
+	else:
+		return None,lambda result:result["Error"] if "Error" in result else repr(result)
+
+def parseInput(Input,fmt=None):
+	printResult(evaluateLine(Input),fmt)
+
+def printResult(result,fmt=None):
+	if fmt is None:
+		if "Error" in result:
+			print(error)
+		else:
+			from pprint import pprint
+			pprint(result,sort_dicts=False,width=1)
+	else:
+		header,format=formatter(fmt)
+		if header is not None:
+			print(header)
+		print(format(result))
+
+class ResultCache:
+	# results of evaluate() keyed on the input string, held in pyparsing's
+	# LRUMemo; entries are retired into its retained set as soon as they are
+	# stored, which is what bounds the cache to its capacity
+	def __init__(self,capacity):
+		from pyparsing.util import LRUMemo
+		self.memo=LRUMemo(capacity)
+		self.capacity=capacity
+		self.hits=0
+		self.misses=0
+		# set by parallelBatch(): the entries then sit in the workers' caches,
+		# and only their hits and misses are added up here
+		self.workers=0
+		self.lock=threading.Lock()
 	
-	# add parse actions for parse-time processing
-	
-	# parse action to multiply out subgroups
-	def multiplyContents(tokens):
-		t = tokens[0]
-		# if these tokens contain a subgroup, then use multiplier to
-		# extend counts of all elements in the subgroup
-		if t.subgroup:
-			mult = t.mult
-			for term in t.subgroup:
-				term[1] *= mult
-			return t.subgroup
-	term.setParseAction(multiplyContents)
-	
-	# add parse action to sum up multiple references to the same element
-	def sumByElement(tokens):
-		elementsList = [t[0] for t in tokens]
-	
-		# construct set to see if there are duplicates
-		duplicates = len(elementsList) > len(set(elementsList))
+	def get(self,Input):
+		with self.lock:
+			try:
+				result=self.memo[Input]
+			except KeyError:
+				self.misses+=1
+			else:
+				self.hits+=1
+				return result
+		result=evaluateSafe(Input)
+		with self.lock:
+			self.memo[Input]=result
+			del self.memo[Input]
+		return result
 	
-		# if there are duplicate element names, sum up by element and
-		# return a new nested ParseResults
-		if duplicates:
-			ctr = defaultdict(int)
-			for t in tokens:
-				ctr[t[0]] += t[1]
-			return ParseResults([ParseResults([k,v]) for k,v in ctr.items()])
-	formula.setParseAction(sumByElement)
-	return formula.parseString(Input)
-
-def parseInput(Input):
+	def stats(self):
+		if self.workers:
+			return "cache: %d hits, %d misses in %d worker processes"%(self.hits,self.misses,self.workers)
+		return "cache: %d hits, %d misses, %d/%d entries"%(self.hits,self.misses,len(self.memo._memory),self.capacity)
+
+cache=None
+
+def enableCache(capacity):
+	global cache
+	cache=ResultCache(capacity) if capacity>0 else None
+
+def evaluateSafe(Input):
 	try:
-		if Input.islower():
-			result=parseElement(Input)
-		else:
-			result=parseCompound(Input)
-	except:
-		print("Incorrect Element/Molecule")
-		return
-	pprint(getResult(result),sort_dicts=False,width=1)
+		return evaluate(Input)
+	except Exception:
+		return {"Error":error}
+
+def evaluateLine(line):
+	Input=line.strip()
+	if cache is None:
+		return evaluateSafe(Input)
+	return cache.get(Input)
+
+def writeResults(results,out,fmt=None,columns=fields):
+	header,format=formatter(fmt,columns)
+	if header is not None:
+		out.write(header+"\n")
+	for result in results:
+		out.write(format(result)+"\n")
+
+def batch(lines,out,fmt=None):
+	# one input per line in, one result per line out; nothing is held on to
+	# between lines, so memory stays flat however long the input is
+	writeResults(map(evaluateLine,lines),out,fmt)
+
+def initWorker(capacity,packrat=False):
+	FormulaParser.grammar()
+	if packrat:
+		FormulaParser.enablePackrat(packrat)
+	enableCache(capacity)
+
+def counters():
+	# cache hits and misses, then packrat hits and misses
+	return [cache.hits if cache else 0,cache.misses if cache else 0]+FormulaParser.packratStats
+
+def evaluateChunk(lines,fmt):
+	# also hands back how much the worker's counters moved for this chunk, so
+	# the parent can report totals
+	header,format=formatter(fmt)
+	before=counters()
+	output="".join([format(evaluateLine(line))+"\n" for line in lines])
+	return output,[after-start for after,start in zip(counters(),before)]
+
+def collectChunk(future):
+	output,(hits,misses,packratHits,packratMisses)=future.result()
+	if cache:
+		cache.hits+=hits
+		cache.misses+=misses
+	FormulaParser.packratStats[0]+=packratHits
+	FormulaParser.packratStats[1]+=packratMisses
+	return output
+
+def parallelBatch(lines,out,fmt=None,jobs=None,chunksize=1024):
+	# same output as batch(), but chunks of lines are evaluated by a pool of
+	# worker processes; only a bounded window of chunks is in flight at a
+	# time and results are written in submission order
+	header,format=formatter(fmt)
+	if header is not None:
+		out.write(header+"\n")
+	jobs=jobs or os.cpu_count()
+	lines=iter(lines)
+	pending=collections.deque()
+	import concurrent.futures
+	capacity=cache.capacity if cache else 0
+	if cache:
+		cache.workers=jobs
+	with concurrent.futures.ProcessPoolExecutor(jobs,initializer=initWorker,initargs=(capacity,FormulaParser.packrat)) as executor:
+		while chunk:=list(itertools.islice(lines,chunksize)):
+			pending.append(executor.submit(evaluateChunk,chunk,fmt))
+			if len(pending)>=jobs*4:
+				out.write(collectChunk(pending.popleft()))
+		while pending:
+			out.write(collectChunk(pending.popleft()))
 	
-def repl():
+def repl(fmt=None):
+	import readline
 	while True:
 		Input=input('>> ')
-		parseInput(Input)
+		parseInput(Input,fmt)
 
 def main():
-    if len(sys.argv)==1:
-    	try:
-    	   repl()
-    	except (EOFError,KeyboardInterrupt):
-    		print()
-    		exit()
-    else:
-    	if sys.argv[-1]=="--table":
-    		print(table)
-    		exit()
-    	Input=sys.argv[1]
-    	parseInput(Input)
+	parser=argparse.ArgumentParser(prog="element",description="Information about the periodic table in the terminal.")
+	parser.add_argument("Input",nargs="?",help="name, symbol or atomic number of an element, or a compound formula")
+	parser.add_argument("--table",action="store_true",help="print the periodic table")
+	parser.add_argument("--batch",metavar="FILE",help="evaluate every line of FILE ('-' for stdin), one result per line")
+	parser.add_argument("--jobs",type=int,default=1,metavar="N",help="evaluate --batch input with N worker processes (0 for one per core)")
+	parser.add_argument("--format",choices=["jsonl","csv","tsv"],help="print results as JSON Lines, CSV or TSV instead of Python dicts")
+	parser.add_argument("--cache-size",type=int,default=4096,metavar="N",help="remember the last N results in the REPL and --batch (0 to disable)")
+	parser.add_argument("--stats",action="store_true",help="print cache (and, with --serve, latency) statistics to stderr when done")
+	parser.add_argument("--packrat",nargs="?",const="lru",choices=["fifo","lru","2q"],metavar="POLICY",help="memoise the pyparsing formula grammar (packrat parsing), which only parses what the fast path cannot; POLICY is the cache's eviction policy, fifo, lru (the default) or 2q")
+	parser.add_argument("--query",metavar="EXPR",help="list the elements matching EXPR, e.g. 'MeltingPoint > 2000 and Density < 10 sort by Density'")
+	parser.add_argument("--mass-search",type=float,metavar="MASS",help="list the formulas whose molar mass is within --ppm of MASS")
+	parser.add_argument("--ppm",type=float,default=5,help="tolerance of --mass-search in parts per million (default: 5)")
+	parser.add_argument("--elements",default="CHNOPS",metavar="SPEC",help="elements --mass-search may use, with optional count ranges, e.g. 'C H N0-4 O S0-1' (default: CHNOPS)")
+	parser.add_argument("--limit",type=int,default=100,metavar="N",help="print at most the N closest --mass-search results (default: 100)")
+	parser.add_argument("--balance",nargs="?",const="",metavar="EQUATION",help="balance EQUATION, e.g. 'Fe + O2 -> Fe2O3', or with --batch every line of FILE")
+	parser.add_argument("--isotopes",metavar="FORMULA",help="print the isotope pattern of FORMULA, one peak per nominal mass")
+	parser.add_argument("--threshold",type=float,default=1e-4,help="leave out --isotopes peaks smaller than THRESHOLD times the largest, from 0 up to 1 (default: 1e-4)")
+	parser.add_argument("--scan",metavar="FILE",help="list every formula in the text of FILE with its byte offset and molar mass")
+	parser.add_argument("--serve",metavar="SOCKET",help="keep the tables loaded and answer queries on SOCKET, a Unix socket path or HOST:PORT")
+	parser.add_argument("--connect",metavar="SOCKET",default=os.environ.get("ELEMENT_SOCKET"),help="send queries to a running --serve instance (default: $ELEMENT_SOCKET)")
+	args=parser.parse_args()
+	if args.balance=="" and args.batch is None:
+		parser.error("--balance needs an EQUATION or --batch FILE")
+	if not 0<=args.threshold<1:
+		parser.error("--threshold must be at least 0 and below 1")
+	if args.jobs<0:
+		parser.error("--jobs must be 0 or more")
+	
+	# the result cache only serves the REPL, --batch and --serve; the other
+	# modes never look at it, and it costs them the import of pyparsing
+	other=(args.table,args.query,args.mass_search,args.balance,args.isotopes,args.scan)
+	if not any(option not in (None,False) for option in other) and (args.serve is not None or args.batch is not None or args.Input is None):
+		enableCache(args.cache_size)
+	if args.packrat:
+		FormulaParser.enablePackrat(args.packrat)
+	try:
+		run(args)
+	finally:
+		if args.stats and cache:
+			print(cache.stats(),file=sys.stderr)
+		if args.stats and FormulaParser.packrat:
+			print(FormulaParser.stats(),file=sys.stderr)
 
+def run(args):
+	connection=None
+	if args.connect and args.serve is None and (args.batch is not None or args.Input is not None):
+		from . import client
+		connection=client.connect(args.connect)
 	
+	if args.table:
+		print(table)
+	elif args.query is not None:
+		from . import query
+		try:
+			columns,results=query.query(args.query)
+		except Exception as exception:
+			print("Incorrect Query: %s"%exception)
+			return
+		writeResults(results,sys.stdout,args.format,columns)
+	elif args.mass_search is not None:
+		from . import search
+		try:
+			results=search.search(args.mass_search,args.ppm,args.elements,args.limit)
+		except ValueError as exception:
+			print("Incorrect Mass Search: %s"%exception)
+			return
+		writeResults(results,sys.stdout,args.format,["Formula","Mass","Error (ppm)"])
+	elif args.balance is not None:
+		from . import balance
+		if args.batch is None:
+			writeResults([balance.balanceLine(args.balance)],sys.stdout,args.format,balance.columns)
+			return
+		sys.stdout.flush()
+		with io.open(sys.stdout.fileno(),"w",buffering=1<<16,encoding=sys.stdout.encoding,closefd=False) as out:
+			with (sys.stdin if args.batch=="-" else open(args.batch,"r")) as lines:
+				writeResults(map(balance.balanceLine,lines),out,args.format,balance.columns)
+	elif args.isotopes is not None:
+		from . import isotopes
+		try:
+			results=isotopes.isotopes(args.isotopes,args.threshold)
+		except Exception as exception:
+			print("Incorrect Formula: %s"%exception)
+			return
+		writeResults(results,sys.stdout,args.format,isotopes.columns)
+	elif args.scan is not None:
+		from . import scan
+		sys.stdout.flush()
+		with io.open(sys.stdout.fileno(),"w",buffering=1<<16,encoding=sys.stdout.encoding,closefd=False) as out:
+			with open(args.scan,"rb") as file:
+				writeResults(scan.scanResults(file),out,args.format,scan.columns)
+	elif args.serve is not None:
+		from . import server
+		server.serve(args.serve,args.stats)
+	elif args.batch is not None:
+		sys.stdout.flush()
+		with io.open(sys.stdout.fileno(),"w",buffering=1<<16,encoding=sys.stdout.encoding,closefd=False) as out:
+			with (sys.stdin if args.batch=="-" else open(args.batch,"r")) as lines:
+				if connection is not None:
+					writeResults(client.query(connection,lines),out,args.format)
+				elif args.jobs==1:
+					batch(lines,out,args.format)
+				else:
+					parallelBatch(lines,out,args.format,args.jobs)
+	elif args.Input is not None:
+		if connection is not None:
+			printResult(next(client.query(connection,[args.Input])),args.format)
+		else:
+			parseInput(args.Input,args.format)
+	else:
+		try:
+			repl(args.format)
+		except (EOFError,KeyboardInterrupt):
+			print()
+			exit()
@@ -0,0 +1,112 @@
+# Balancing chemical equations, e.g.
+#
+#     Fe + O2 -> Fe2O3                            4Fe + 3O2 -> 2Fe2O3
+#     KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2      2KMnO4 + 16HCl -> 2KCl + 2MnCl2 + 8H2O + 5Cl2
+#
+# Every species is parsed with parseCompound, and the equation becomes a
+# matrix with one row per element and one column per species, holding the
+# species' count of that element (negated for products). The coefficients
+# are the nullspace of that matrix, computed exactly by integer row reduction
+# and scaled to the smallest integers. Coefficients already written in the
+# equation are ignored.
+
+import math
+import re
+from fractions import Fraction
+
+import element
+
+arrow=re.compile(r"\s*(?:<?-+>|<?=+>|→|=)\s*")
+coefficient=re.compile(r"^\d+\s*")
+
+def parseEquation(text):
+	# ([reactants], [products]) as written, without their coefficients
+	sides=arrow.split(text.strip())
+	if len(sides)!=2:
+		raise ValueError("expected reactants -> products")
+	reactants,products=([coefficient.sub("",species.strip()) for species in side.split("+")] for side in sides)
+	if not all(reactants) or not all(products):
+		raise ValueError("missing species")
+	return reactants,products
+
+def reduce(matrix):
+	# turns matrix (rows of ints) into reduced row echelon form in place,
+	# except that pivots are left unnormalised so every entry stays an
+	# integer: rows are combined by cross-multiplying and then divided by
+	# their gcd, which keeps the numbers small. Returns the pivot columns.
+	pivots=[]
+	for column in range(len(matrix[0])):
+		row=len(pivots)
+		if row==len(matrix):
+			break
+		pivot=next((candidate for candidate in range(row,len(matrix)) if matrix[candidate][column]),None)
+		if pivot is None:
+			continue
+		matrix[row],matrix[pivot]=matrix[pivot],matrix[row]
+		lead=matrix[row][column]
+		for other in range(len(matrix)):
+			factor=matrix[other][column]
+			if other!=row and factor:
+				combined=[lead*value-factor*reduced for value,reduced in zip(matrix[other],matrix[row])]
+				divisor=math.gcd(*combined) or 1
+				matrix[other]=[value//divisor for value in combined]
+		pivots.append(column)
+	return pivots
+
+def nullspace(matrix):
+	# a basis of the vectors x with matrix @ x == 0, one per free column, as
+	# Fractions
+	columns=len(matrix[0])
+	pivots=reduce(matrix)
+	basis=[]
+	for free in sorted(set(range(columns))-set(pivots)):
+		vector=[Fraction(0)]*columns
+		vector[free]=Fraction(1)
+		for row,pivot in enumerate(pivots):
+			vector[pivot]=Fraction(-matrix[row][free],matrix[row][pivot])
+		basis.append(vector)
+	return basis
+
+def coefficients(reactants,products):
+	# smallest positive integer coefficients, reactants then products
+	masses=element.massTable()
+	counts=[dict(element.parseCompound(species)) for species in reactants+products]
+	for species,amounts in zip(reactants+products,counts):
+		for symbol in amounts:
+			if symbol not in masses:
+				raise ValueError("no element %s in %s"%(symbol,species))
+	symbols=dict.fromkeys(symbol for amounts in counts for symbol in amounts)
+	matrix=[[amounts.get(symbol,0) if position<len(reactants) else -amounts.get(symbol,0)
+			for position,amounts in enumerate(counts)] for symbol in symbols]
+
+	basis=nullspace(matrix)
+	if not basis:
+		raise ValueError("cannot be balanced")
+	if len(basis)>1:
+		raise ValueError("can be balanced in %d independent ways, split it into separate reactions"%len(basis))
+	vector=basis[0]
+	if all(value<=0 for value in vector):
+		vector=[-value for value in vector]
+	if any(value<=0 for value in vector):
+		raise ValueError("cannot be balanced with every species taking part")
+	scale=math.lcm(*(value.denominator for value in vector))
+	integers=[int(value*scale) for value in vector]
+	divisor=math.gcd(*integers)
+	return [value//divisor for value in integers]
+
+def balance(text):
+	# the balanced equation as a string, e.g. "4Fe + 3O2 -> 2Fe2O3"
+	reactants,products=parseEquation(text)
+	amounts=coefficients(reactants,products)
+	terms=[("" if amount==1 else str(amount))+species for amount,species in zip(amounts,reactants+products)]
+	return " + ".join(terms[:len(reactants)])+" -> "+" + ".join(terms[len(reactants):])
+
+columns=["Equation","Balanced","Error"]
+
+def balanceLine(line):
+	# one result dict per equation, for printing like any other result
+	text=line.strip()
+	try:
+		return {"Equation":text,"Balanced":balance(text)}
+	except Exception as exception:
+		return {"Equation":text,"Error":"Incorrect Equation: %s"%exception}
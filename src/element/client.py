@@ -0,0 +1,63 @@
+# The client side of the query server in server.py: sends inputs to a running
+# --serve instance and reads back its replies. It only needs sockets, json
+# and a thread, so a --connect call does not pay for importing asyncio.
+
+import contextlib
+import json
+import os
+import socket
+import threading
+
+def address(spec):
+	# HOST:PORT for TCP, anything else is the path of a Unix socket
+	host,_,port=spec.rpartition(":")
+	if host and port.isdigit() and os.sep not in spec:
+		return (host,int(port))
+	return spec
+
+def connect(spec):
+	# returns None when no server is listening, so the caller can fall back
+	# to evaluating locally
+	where=address(spec)
+	try:
+		if isinstance(where,tuple):
+			return socket.create_connection(where)
+		connection=socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+	except OSError:
+		return None
+	try:
+		connection.connect(where)
+	except OSError:
+		connection.close()
+		return None
+	return connection
+
+def query(connection,lines):
+	# yields one result dict per line; lines are sent from a separate thread
+	# so neither side stalls on a full socket buffer. Should the server go
+	# away early, every line left without a reply gets an error result, so
+	# there is still one result per line
+	sent=0
+	def send():
+		nonlocal sent
+		with contextlib.suppress(OSError):
+			for line in lines:
+				sent+=1
+				connection.sendall(line.rstrip("\n").encode("utf-8")+b"\n")
+		with contextlib.suppress(OSError):
+			connection.shutdown(socket.SHUT_WR)
+
+	missing={"Error":"no reply from the server"}
+	received=0
+	sender=threading.Thread(target=send,daemon=True)
+	sender.start()
+	with connection,connection.makefile("rb") as replies:
+		with contextlib.suppress(OSError):
+			for reply in replies:
+				received+=1
+				yield json.loads(reply)
+		sender.join()
+	for _ in range(sent-received):
+		yield missing
+	for _ in lines:
+		yield missing
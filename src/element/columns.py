@@ -0,0 +1,151 @@
+# The table as columns: one array per numeric field of elements.json,
+# indexed by atomic number (entry 0 is unused) with NaN where the data has
+# null. Compound properties are dot products of a formula's counts against
+# these columns, e.g.
+#
+#     columns=Columns(element.pt)
+#     counts=element.parseCompound("C6H12O6")
+#     columns.dot(counts,"AtomicMass")           # molar mass
+#     columns.mean(counts,"Electronegativity")   # count-weighted mean
+#     columns.fractions(counts)                  # mass fraction per element
+#
+# Many formulas at once go through a CountMatrix, a sparse formula x element
+# matrix of counts; molarMasses() multiplies it against the mass column in
+# one go:
+#
+#     matrix=columns.matrix(element.parseCompound(text) for text in formulas)
+#     columns.molarMasses(matrix)              # floats
+#     columns.molarMasses(matrix,exact=True)   # Decimals
+#
+# The arrays are NumPy arrays when NumPy is installed and plain lists
+# otherwise; both give the same answers.
+
+import itertools
+import math
+from decimal import Decimal
+
+import element
+
+try:
+	import numpy
+except ImportError:
+	numpy=None
+
+numeric=["AtomicMass","NumberofNeutrons","NumberofProtons","NumberofElectrons","Period","Group",
+		"AtomicRadius","Electronegativity","FirstIonization","Density","MeltingPoint","BoilingPoint",
+		"NumberOfIsotopes","Year","SpecificHeat","NumberofShells","NumberofValence"]
+
+class Columns:
+	def __init__(self,database):
+		self.database=database
+		self.numbers=database.column("AtomicNumber")
+		self.size=max(self.numbers)+1
+		self.positions={symbol:number for symbol,number in zip(database.column("Symbol"),self.numbers)}
+		self.arrays={}
+
+	def __getitem__(self,field):
+		if field not in self.arrays:
+			if field not in numeric:
+				raise KeyError(field)
+			values=[math.nan]*self.size
+			for number,value in zip(self.numbers,self.database.column(field)):
+				if value is not None:
+					values[number]=float(value)
+			self.arrays[field]=numpy.array(values) if numpy else values
+		return self.arrays[field]
+
+	def vector(self,counts):
+		# a formula's [symbol, count] pairs as (atomic numbers, counts)
+		numbers=[self.positions[symbol] for symbol,count in counts]
+		amounts=[count for symbol,count in counts]
+		if numpy:
+			return numpy.array(numbers,dtype=numpy.intp),numpy.array(amounts,dtype=numpy.float64)
+		return numbers,amounts
+
+	def dot(self,counts,field):
+		# sum of count*value over the formula, or None if any value is null
+		numbers,amounts=self.vector(counts)
+		values=self[field]
+		if numpy:
+			total=float(values[numbers]@amounts)
+		else:
+			total=math.fsum(values[number]*amount for number,amount in zip(numbers,amounts))
+		return None if math.isnan(total) else total
+
+	def mean(self,counts,field):
+		total=self.dot(counts,field)
+		atoms=sum(count for symbol,count in counts)
+		return None if total is None or not atoms else total/atoms
+
+	def matrix(self,formulas):
+		return CountMatrix(self,formulas)
+
+	def scaledMasses(self):
+		# atomic masses as integers, scaled by 10**places so every mass in
+		# elements.json is exact
+		if "scaled masses" not in self.arrays:
+			masses=element.massTable()
+			places=max(0,max(-mass.as_tuple().exponent for mass in masses.values()))
+			scaled=[0]*self.size
+			for symbol,mass in masses.items():
+				scaled[self.positions[symbol]]=int(mass.scaleb(places))
+			self.arrays["scaled masses"]=(places,numpy.array(scaled,dtype=numpy.int64) if numpy else scaled)
+		return self.arrays["scaled masses"]
+
+	def molarMasses(self,matrix,exact=False):
+		# molar mass of every row of matrix, bit-identical to getResult: the
+		# sums are exact integers in units of 10**-places, and dividing them
+		# by 10**places rounds correctly, just like float() of the exact
+		# Decimal sum; exact=True returns those Decimals instead
+		places,scaled=self.scaledMasses()
+		if numpy:
+			products=matrix.counts*scaled[matrix.numbers]
+			starts=matrix.indptr[:-1]
+			nonempty=starts<matrix.indptr[1:]
+			totals=numpy.zeros(len(starts),dtype=numpy.int64)
+			if products.size:
+				totals[nonempty]=numpy.add.reduceat(products,starts[nonempty])
+			if not exact and (not totals.size or numpy.abs(totals).max()<2**53):
+				# below 2**53 the conversion to float64 is exact, so the
+				# division is the only rounding step
+				return totals/float(10**places)
+			totals=[int(total) for total in totals]
+		else:
+			totals=[sum(scaled[number]*count for number,count in zip(matrix.numbers[start:end],matrix.counts[start:end]))
+					for start,end in itertools.pairwise(matrix.indptr)]
+		if exact:
+			return [Decimal(total).scaleb(-places) for total in totals]
+		masses=[total/10**places for total in totals]
+		return numpy.array(masses) if numpy else masses
+
+	def fractions(self,counts,field="AtomicMass"):
+		# each element's share of dot(counts, field)
+		total=self.dot(counts,field)
+		if not total:
+			return None
+		values=self[field]
+		return {symbol:count*float(values[self.positions[symbol]])/total for symbol,count in counts}
+
+class CountMatrix:
+	# formulas x elements counts in compressed sparse row form: formula i has
+	# counts[indptr[i]:indptr[i+1]] of the atomic numbers in the same slice
+	# of numbers
+	def __init__(self,columns,formulas):
+		indptr=[0]
+		numbers=[]
+		counts=[]
+		for formula in formulas:
+			for symbol,count in formula:
+				numbers.append(columns.positions[symbol])
+				counts.append(count)
+			indptr.append(len(numbers))
+		if numpy:
+			indptr=numpy.array(indptr,dtype=numpy.intp)
+			numbers=numpy.array(numbers,dtype=numpy.intp)
+			counts=numpy.array(counts,dtype=numpy.int64)
+		self.indptr=indptr
+		self.numbers=numbers
+		self.counts=counts
+
+	def __len__(self):
+		return len(self.indptr)-1
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# elements.bin is elements.json precompiled with marshal, so that startup
+# does not have to decode every record to look up one element.
+#
+# Layout: a little-endian uint32 giving the length of the header, the
+# marshalled header, then one marshalled tuple per element. The header holds
+# the element names, the field names, the offset of every row and a few
+# columns (symbols, atomic numbers and masses) that are needed for every
+# element up front.
+#
+# Regenerate it after editing elements.json:  python3 src/element/database.py
+
+import collections.abc
+import marshal
+import struct
+
+header_columns=["Symbol","AtomicNumber","AtomicMass"]
+
+def compileDatabase(records):
+	names=list(records)
+	fields=list(records[names[0]])
+	rows=[marshal.dumps(tuple(records[name][field] for field in fields)) for name in names]
+	offsets=[0]
+	for row in rows:
+		offsets.append(offsets[-1]+len(row))
+	header=marshal.dumps({
+		"names":names,
+		"fields":fields,
+		"offsets":offsets,
+		"columns":{field:[records[name][field] for name in names] for field in header_columns},
+	})
+	return struct.pack("<I",len(header))+header+b"".join(rows)
+
+class Database(collections.abc.Mapping):
+	# read-only name -> record mapping over a compiled database; a record is
+	# decoded the first time it is asked for and kept afterwards
+	def __init__(self,data):
+		data=memoryview(data)
+		size,=struct.unpack_from("<I",data)
+		header=marshal.loads(data[4:4+size])
+		self.names=header["names"]
+		self.fields=header["fields"]
+		self.offsets=header["offsets"]
+		self.columns={field:[strip(value) for value in values] for field,values in header["columns"].items()}
+		self.positions={name:position for position,name in enumerate(self.names)}
+		self.rows=data[4+size:]
+		self.records={}
+
+	def __getitem__(self,name):
+		try:
+			return self.records[name]
+		except KeyError:
+			position=self.positions[name]
+		row=marshal.loads(self.rows[self.offsets[position]:self.offsets[position+1]])
+		record=self.records[name]=dict(zip(self.fields,row))
+		return record
+
+	def __iter__(self):
+		return iter(self.names)
+
+	def __len__(self):
+		return len(self.names)
+
+	def __contains__(self,name):
+		return name in self.positions
+
+	def column(self,field):
+		# values of field for every element, in table order, strings without
+		# the stray spaces some of them carry (the symbols "Ds ", "Rg ", "Cn ")
+		if field in self.columns:
+			return self.columns[field]
+		return [strip(self[name][field]) for name in self.names]
+
+def strip(value):
+	return value.strip() if isinstance(value,str) else value
+
+if __name__=="__main__":
+	import json
+	import os
+
+	directory=os.path.dirname(os.path.abspath(__file__))
+	with open(os.path.join(directory,"elements.json"),"r") as source:
+		records=json.load(source)
+	with open(os.path.join(directory,"elements.bin"),"wb") as target:
+		target.write(compileDatabase(records))
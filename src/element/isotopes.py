@@ -0,0 +1,112 @@
+# Isotope patterns: the masses a formula shows up at in a mass spectrum and
+# how much of it sits at each, from the natural isotopes of its elements in
+# isotopes.json (symbol -> [[mass number, exact mass, abundance], ...]), the
+# NIST isotopic compositions of every element that has one: all up to
+# uranium but technetium, promethium and polonium to actinium.
+#
+# A distribution is kept per nominal mass: peaks holds, for each mass number
+# from start upwards, the probability of that mass number and the
+# probability-weighted mean exact mass of the isotope combinations giving
+# it. That is the aggregated pattern a mass spectrometer resolves, and its
+# length only grows with the spread of the pattern, not with the number of
+# combinations. n atoms of an element are that element's distribution raised
+# to the n-th power by repeated squaring, and the elements are then
+# multiplied together; after every multiplication the tails below threshold
+# times the largest peak are cut off, which keeps each step short.
+
+import json
+
+import element
+
+data=None
+
+def isotopeTable():
+	global data
+	if data is None:
+		data=json.loads(element.readResource("isotopes.json"))
+	return data
+
+class Distribution:
+	def __init__(self,start,probabilities,masses):
+		# masses[i] is probability-weighted: sum of probability*mass
+		self.start=start
+		self.probabilities=probabilities
+		self.masses=masses
+
+	@classmethod
+	def of(cls,symbol):
+		try:
+			isotopes=isotopeTable()[symbol]
+		except KeyError:
+			raise ValueError("%s has no natural isotopic composition"%symbol) from None
+		start=min(number for number,mass,abundance in isotopes)
+		size=max(number for number,mass,abundance in isotopes)-start+1
+		total=sum(abundance for number,mass,abundance in isotopes)
+		probabilities=[0.0]*size
+		masses=[0.0]*size
+		for number,mass,abundance in isotopes:
+			probabilities[number-start]+=abundance/total
+			masses[number-start]+=abundance/total*mass
+		return cls(start,probabilities,masses)
+
+	def multiply(self,other,threshold):
+		# the distribution of the sum of one draw from each
+		probabilities=[0.0]*(len(self.probabilities)+len(other.probabilities)-1)
+		masses=[0.0]*len(probabilities)
+		for i,(p,m) in enumerate(zip(self.probabilities,self.masses)):
+			if not p:
+				continue
+			for j,(q,n) in enumerate(zip(other.probabilities,other.masses)):
+				probabilities[i+j]+=p*q
+				masses[i+j]+=m*q+p*n
+		return Distribution(self.start+other.start,probabilities,masses).prune(threshold)
+
+	def power(self,count,threshold):
+		result=None
+		square=self
+		while count:
+			if count&1:
+				result=square if result is None else result.multiply(square,threshold)
+			count>>=1
+			if count:
+				square=square.multiply(square,threshold)
+		return result
+
+	def prune(self,threshold):
+		# drops the peaks at either end below threshold times the largest
+		cutoff=max(self.probabilities)*threshold
+		first=0
+		last=len(self.probabilities)
+		while self.probabilities[first]<cutoff:
+			first+=1
+		while self.probabilities[last-1]<cutoff:
+			last-=1
+		if first==0 and last==len(self.probabilities):
+			return self
+		return Distribution(self.start+first,self.probabilities[first:last],self.masses[first:last])
+
+def pattern(counts,threshold=1e-4):
+	# [(mass, abundance)] of every peak above threshold times the largest,
+	# for a formula's [symbol, count] pairs
+	result=None
+	for symbol,count in counts:
+		if count:
+			distribution=Distribution.of(symbol).power(count,threshold)
+			result=distribution if result is None else result.multiply(distribution,threshold)
+	if result is None:
+		return []
+	cutoff=max(result.probabilities)*threshold
+	return [(m/p,p) for p,m in zip(result.probabilities,result.masses) if p and p>=cutoff]
+
+columns=["Mass","Abundance","Intensity"]
+
+def isotopes(formula,threshold=1e-4):
+	# one result dict per peak: mean exact mass, fraction of all molecules,
+	# and intensity as a percentage of the largest peak
+	if not 0<=threshold<1:
+		raise ValueError("the threshold must be at least 0 and below 1")
+	peaks=pattern(element.parseCompound(formula),threshold)
+	if not peaks:
+		raise ValueError("%s has no atoms"%formula)
+	largest=max(p for m,p in peaks)
+	return [{"Mass":round(m,6),"Abundance":p,"Intensity":round(p/largest*100,4)} for m,p in peaks]
@@ -0,0 +1,158 @@
+# Filtering and sorting the whole table by any of its fields, e.g.
+#
+#     MeltingPoint > 2000 and Density < 10 sort by Density desc
+#     Phase = gas or Type = "Noble Gas"
+#     Radioactive = yes and Year != null sort by Year
+#
+# Conditions compare a field of elements.json, or the element's Name (in any
+# case), with a number, a word, a quoted string or null; "and" binds tighter than "or". Elements
+# whose field is null only ever match "= null".
+#
+# Every field gets a sorted index of its numeric values and a hash index of
+# all its values, built on first use, so a condition is answered with a
+# bisection or a dict probe instead of a pass over the records.
+
+import bisect
+import threading
+
+import element
+
+class QueryParser:
+	_query=None
+	_lock=threading.Lock()
+
+	@staticmethod
+	def build():
+		from pyparsing import (CaselessKeyword, Word, alphas, alphanums, one_of,
+								QuotedString, Group, Optional, ZeroOrMore, Suppress,
+								pyparsing_common)
+
+		keywords=["and","or","sort","by","asc","desc","null"]
+		AND,OR,SORT,BY,ASC,DESC,NULL=map(CaselessKeyword,keywords)
+		def notKeyword(tokens):
+			return tokens[0].lower() not in keywords
+
+		field=Word(alphas,alphanums+"_").add_condition(notKeyword)
+		operator=one_of("<= >= != == < > =")
+		NULL.set_parse_action(lambda t:[None])
+		value=(pyparsing_common.number|QuotedString('"')|QuotedString("'")|NULL
+				|Word(alphanums+"-_.").add_condition(notKeyword))
+		condition=Group(field+operator+value)
+		conjunction=Group(condition+ZeroOrMore(Suppress(AND)+condition))
+		expression=Group(conjunction+ZeroOrMore(Suppress(OR)+conjunction))
+		order=Suppress(SORT)+Suppress(Optional(BY))+field("sort")+Optional(ASC|DESC)("order")
+		return Optional(expression("where"))+Optional(order)
+
+	@classmethod
+	def parse(cls,text):
+		if cls._query is None:
+			with cls._lock:
+				if cls._query is None:
+					cls._query=cls.build()
+		return cls._query.parseString(text,parseAll=True)
+
+class Index:
+	def __init__(self,database):
+		self.database=database
+		self.names=list(database)
+		# the name is the key of each record rather than a field of it, but
+		# can be filtered and sorted on all the same
+		self.fields={"name":"Name"}|{field.casefold():field for field in database.fields}
+		self.columns={}
+		self.sorted={}
+		self.hashed={}
+
+	def field(self,name):
+		try:
+			return self.fields[name.casefold()]
+		except KeyError:
+			raise ValueError("no field %r"%name) from None
+
+	def column(self,field):
+		if field not in self.columns:
+			self.columns[field]=self.names if field=="Name" else self.database.column(field)
+		return self.columns[field]
+
+	def numeric(self,field):
+		# (values, positions) of the numeric entries of field, by value
+		if field not in self.sorted:
+			pairs=sorted((value,position) for position,value in enumerate(self.column(field))
+						if isinstance(value,(int,float)) and not isinstance(value,bool))
+			self.sorted[field]=([value for value,position in pairs],[position for value,position in pairs])
+		return self.sorted[field]
+
+	def lookup(self,field):
+		# value (case-folded if a string) -> positions holding it
+		if field not in self.hashed:
+			table={}
+			for position,value in enumerate(self.column(field)):
+				table.setdefault(fold(value),set()).add(position)
+			self.hashed[field]=table
+		return self.hashed[field]
+
+	def select(self,name,operator,value):
+		field=self.field(name)
+		if operator in ("=","=="):
+			return set(self.lookup(field).get(fold(value),()))
+		if operator=="!=":
+			positions=set(range(len(self.names)))-self.lookup(field).get(None,set())
+			return positions-self.lookup(field).get(fold(value),set())
+		if not isinstance(value,(int,float)):
+			raise ValueError("%s %s needs a number"%(name,operator))
+		values,positions=self.numeric(field)
+		if operator=="<":
+			return set(positions[:bisect.bisect_left(values,value)])
+		if operator=="<=":
+			return set(positions[:bisect.bisect_right(values,value)])
+		if operator==">":
+			return set(positions[bisect.bisect_right(values,value):])
+		return set(positions[bisect.bisect_left(values,value):])
+
+	def order(self,positions,name,descending=False):
+		# positions ordered by a field, elements without a numeric value last
+		field=self.field(name)
+		ranked=[position for position in self.numeric(field)[1] if position in positions]
+		if descending:
+			ranked.reverse()
+		rest=sorted(positions.difference(ranked))
+		if not self.numeric(field)[0]:
+			rest.sort(key=lambda position:fold(self.column(field)[position]) or "",reverse=descending)
+		return ranked+rest
+
+def fold(value):
+	return value.casefold() if isinstance(value,str) else value
+
+index=None
+
+def query(text):
+	# returns the output columns and one result dict per matching element
+	global index
+	if index is None:
+		index=Index(element.pt)
+	parsed=QueryParser.parse(text)
+
+	referenced=[]
+	positions=set(range(len(index.names)))
+	if "where" in parsed:
+		positions=set()
+		for conjunction in parsed["where"]:
+			matched=None
+			for name,operator,value in conjunction:
+				referenced.append(index.field(name))
+				selected=index.select(name,operator,value)
+				matched=selected if matched is None else matched&selected
+			positions|=matched
+	if "sort" in parsed:
+		referenced.append(index.field(parsed["sort"]))
+		positions=index.order(positions,parsed["sort"],parsed.get("order","").lower()=="desc")
+	else:
+		positions=sorted(positions)
+
+	columns=["Name","Symbol"]+[field for field in dict.fromkeys(referenced) if field not in ("Name","Symbol")]
+	results=[]
+	for position in positions:
+		result={"Name":index.names[position]}
+		for field in columns[1:]:
+			result[field]=index.column(field)[position]
+		results.append(result)
+	return columns,results
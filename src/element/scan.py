@@ -0,0 +1,97 @@
+# Chemical formulas in running text, such as lab notebooks and papers: every
+# formula in a file with its byte offset and molar mass, e.g.
+#
+#     Dissolve 5 g NaCl in 100 mL H2O.      (13, 'NaCl', 58.443), (28, 'H2O', 18.013)
+#
+# The strict formula grammar (only the symbols in the table, no whitespace
+# inside a formula) is run through pyparsing's scan_string between word
+# boundaries, so parts of words are not read as formulas. As in
+# parseCompound, scanFormula reads the formula first and the grammar only
+# gets the ones it cannot handle; and a regular expression for the run of
+# symbols, counts and parentheses a formula is made of turns away most words
+# before either is tried. A bare symbol is not reported, since I, In, As or
+# He are as likely to be words: a formula needs a count, parentheses or a
+# second element.
+#
+# The file is memory-mapped and scanned a chunk at a time. Each chunk is
+# read with overlap bytes of what follows, so a formula running past the end
+# of the chunk is still read whole, and with the byte before it, so a word
+# running into the chunk is not mistaken for the start of one. Only formulas
+# starting in the chunk are reported and the next chunk carries on after the
+# last of them, so every formula is reported once. Nothing else is kept
+# between chunks, so memory use does not grow with the size of the file.
+# Chunks are decoded as latin-1, one character per byte, so offsets are byte
+# offsets whatever the file's encoding.
+
+import mmap
+import os
+
+import element
+
+chunkSize=1<<20
+# longest formula read; longer ones are left out rather than cut short
+overlap=1<<12
+
+# the characters no formula starts with, which the scan skips as whitespace:
+# far cheaper than failing a parse at each of them
+skipped=set(map(chr,range(256)))-set("ABCDEFGHIJKLMNOPQRSTUVWXYZ(")
+
+grammar=None
+
+def plainFormula(text,location,tokens):
+	result=element.scanFormula(tokens[0])
+	if result is None:
+		from pyparsing import ParseException
+		raise ParseException(text,location,"not a plain formula")
+	return result
+
+def scanGrammar():
+	global grammar
+	if grammar is None:
+		from pyparsing import WordStart, WordEnd, FollowedBy, Regex, alphanums, CompactParseResults
+		symbols=sorted(element.massTable(),key=len,reverse=True)
+		# the longest run of symbols, counts and parentheses that ends a word;
+		# every formula the grammar reads starts one
+		run=Regex(r"(?:%s|[0-9()])+(?![A-Za-z0-9])"%"|".join(symbols))
+		formula=run.copy().setParseAction(plainFormula)|element.FormulaParser.build(strict=True)
+		grammar=WordStart(alphanums+"(")+FollowedBy(run)+formula+WordEnd(alphanums)
+		grammar.set_whitespace_chars(skipped)
+		grammar.setResultsClass(CompactParseResults)
+	return grammar
+
+def scanText(text):
+	# (start, end, [symbol, count] pairs) of every formula in text
+	for counts,start,end in scanGrammar().scan_string(text):
+		if len(counts)>1 or not text[start:end].isalpha():
+			yield start,end,counts
+
+def scan(file):
+	# (offset, formula, molar mass) of every formula in file, an open binary
+	# file, generated as it is read
+	size=os.fstat(file.fileno()).st_size
+	if not size:
+		return
+	with mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ) as data:
+		resume=0
+		for chunk in range(0,size,chunkSize):
+			first=max(chunk,resume)
+			before=max(first-1,0)
+			limit=min(chunk+chunkSize+overlap,size)
+			window=data[before:limit].decode("latin-1")
+			for start,end,counts in scanText(window):
+				offset=before+start
+				if offset<first:
+					continue
+				if offset>=chunk+chunkSize:
+					break
+				resume=before+end
+				if resume==limit<size:
+					# may go on past the overlap
+					continue
+				yield offset,window[start:end],float(element.molarMass(counts))
+
+columns=["Offset","Formula","Molar Mass"]
+
+def scanResults(file):
+	# one result dict per formula, for printing like any other result
+	return ({"Offset":offset,"Formula":formula,"Molar Mass":mass} for offset,formula,mass in scan(file))
@@ -0,0 +1,209 @@
+# Inverse search: every formula whose molar mass is within a ppm tolerance
+# of a target, built from a set of allowed elements with optional count
+# ranges, e.g. "CHNOPS" or "C0-60 H N0-4 O S0-1".
+#
+# The lightest element is left out of the enumeration: once the counts of
+# all the others are fixed, the only counts of it that can reach the target
+# follow from the mass that is left. The other elements are split into two
+# groups, and for each group every combination of counts that stays below
+# the target is enumerated once as a partial sum. One group's sums are
+# sorted by their remainder modulo the lightest element's mass, so for each
+# sum of the other group the completions that leave a whole number of the
+# lightest element (within tolerance) are a bisection away. That turns a
+# search over the product of all count ranges into two small enumerations,
+# a few thousand sums each for CHNOPS at 1000 Da. Sorted tables are kept,
+# keyed on the element set, and reused by later searches up to the same mass.
+
+import bisect
+import heapq
+import math
+import operator
+import re
+
+import element
+
+constraint=re.compile(r"([A-Z][a-z]*)(?:(\d+)(?:-(\d+))?)?")
+
+def parseConstraints(text):
+	# [(symbol, min, max)]; "C" is any count, "C20" at most 20, "C2-20" a range
+	constraints=[]
+	masses=element.massTable()
+	position=0
+	text=text.replace(",","").replace(" ","")
+	while position<len(text):
+		match=constraint.match(text,position)
+		if match is None or match.group(1) not in masses:
+			raise ValueError("cannot read element constraints at %r"%text[position:])
+		symbol,low,high=match.groups()
+		if any(symbol==seen for seen,_,_ in constraints):
+			raise ValueError("%s is given more than once"%symbol)
+		if high is None:
+			low,high=0,low
+		constraints.append((symbol,int(low),None if high is None else int(high)))
+		position=match.end()
+	if not constraints:
+		raise ValueError("no elements given")
+	return constraints
+
+def choices(mass,low,high,bound):
+	# the counts of one element that fit under bound
+	most=math.floor(bound/mass)
+	return range(low,most+1 if high is None else min(high,most)+1)
+
+def partialSums(group,bound):
+	# (mass, counts) for every combination of counts of group up to bound
+	sums=[(0.0,())]
+	for symbol,mass,low,high in group:
+		sums=[(total+count*mass,counts+(count,)) for total,counts in sums
+				for count in choices(mass,low,high,bound-total)]
+	return sums
+
+def estimate(group,bound):
+	# roughly how many partial sums group has under bound: the volume of
+	# the simplex of free counts, times the ranges of the capped ones
+	size=1.0
+	free=[]
+	for symbol,mass,low,high in group:
+		if high is None:
+			free.append(mass)
+		else:
+			size*=len(choices(mass,low,high,bound))
+	if free:
+		size*=max(1.0,bound**len(free)/(math.factorial(len(free))*math.prod(free)))
+	return size
+
+def split(elements,bound):
+	# two groups whose tables come out about the same size
+	if len(elements)>12:
+		groups=([],[])
+		for item in sorted(elements,key=lambda item:estimate([item],bound),reverse=True):
+			groups[estimate(groups[0],bound)>estimate(groups[1],bound)].append(item)
+		return groups
+	best=None
+	for mask in range(1<<(len(elements)-1)):
+		groups=([],[])
+		for position,item in enumerate(elements):
+			groups[mask>>position&1].append(item)
+		cost=max(estimate(groups[0],bound),estimate(groups[1],bound))
+		if best is None or cost<best[0]:
+			best=cost,groups
+	return best[1]
+
+# largest table a search will build, in partial sums
+limitTable=1000000
+
+tables={}
+
+def table(group,bound,unit):
+	# (bound, residues, masses, counts): the partial sums of group sorted by
+	# their remainder modulo unit, with residues[i] that remainder of
+	# masses[i] and counts[i] the counts behind it; a table built for a
+	# higher bound serves lower ones too
+	key=(tuple(group),unit)
+	cached=tables.get(key)
+	if cached is None or cached[0]<bound:
+		sums=[(total%unit,total,counts) for total,counts in partialSums(group,bound)]
+		sums.sort(key=operator.itemgetter(0))
+		cached=tables[key]=(bound,[item[0] for item in sums],[item[1] for item in sums],[item[2] for item in sums])
+	return cached
+
+def matches(firstMasses,residues,secondMasses,lightest,target,tolerance):
+	# (error, index into first, index into second, count of the lightest
+	# element) of every formula within tolerance: for every sum of the
+	# first table, the sums of the second whose remainders put the total
+	# within tolerance of a whole number of the lightest element. The
+	# window is widened a little so that rounding in the remainders loses
+	# nothing, and every candidate is checked exactly; while it is narrower
+	# than the lightest element, only its nearest count can be within
+	# tolerance (and for counts below zero, which int() rounds up, the
+	# check against fewest or the exact one rejects them)
+	symbol,unit,fewest,most=lightest
+	most=math.inf if most is None else most
+	low=target-tolerance
+	high=target+tolerance
+	width=2*tolerance+1e-9
+	found=[]
+	for index,total in enumerate(firstMasses):
+		if width>=unit:
+			for position,partial in enumerate(secondMasses):
+				partial+=total
+				for count in range(max(fewest,math.floor((low-partial)/unit)),min(most,math.floor((high-partial)/unit)+1)+1):
+					if (error:=abs(partial+count*unit-target))<=tolerance:
+						found.append((error,index,position,count))
+			continue
+		start=(low-total-5e-10)%unit
+		stop=start+width
+		windows=[(bisect.bisect_left(residues,start),bisect.bisect_right(residues,stop))]
+		if stop>unit:
+			windows.append((0,bisect.bisect_right(residues,stop-unit)))
+		for begin,end in windows:
+			found.extend([(error,index,position,count) for position in range(begin,end)
+					if fewest<=(count:=int((target-(partial:=total+secondMasses[position]))/unit+0.5))<=most
+					and (error:=abs(partial+count*unit-target))<=tolerance])
+	return found
+
+def search(target,ppm=5,constraints="CHNOPS",limit=None):
+	# returns one result dict per formula, closest first, at most limit
+	if not target>0:
+		raise ValueError("the target mass must be positive")
+	if not ppm>=0:
+		raise ValueError("the tolerance must not be negative")
+	if limit is not None and limit<1:
+		raise ValueError("the limit must be at least 1")
+	masses=element.massTable()
+	# masses in elements.json have a few decimals, so formulas often land
+	# exactly on the edge of the tolerance; the slack keeps rounding in the
+	# float sums from deciding whether they are in
+	tolerance=target*ppm/1e6+1e-9
+	elements=[(symbol,float(masses[symbol]),low,high) for symbol,low,high in parseConstraints(constraints)]
+	lightest=min(elements,key=lambda item:item[1])
+	symbol,unit,fewest,most=lightest
+	# what is left for the other elements once the fewest allowed of the
+	# lightest are in
+	bound=target+tolerance-fewest*unit
+	if bound<0:
+		return []
+	rest=[item for item in elements if item is not lightest]
+	first,second=split(rest,bound) if rest else ([],[])
+	if max(estimate(first,bound),estimate(second,bound))>limitTable:
+		raise ValueError("too many combinations below %g, give the elements narrower count ranges"%bound)
+
+	firstMasses,firstCounts=table(first,bound,unit)[2:]
+	residues,secondMasses,secondCounts=table(second,bound,unit)[1:]
+	if len(firstMasses)>len(secondMasses):
+		first,second=second,first
+		firstMasses,firstCounts=table(first,bound,unit)[2:]
+		residues,secondMasses,secondCounts=table(second,bound,unit)[1:]
+	if not firstMasses or not secondMasses:
+		# the lower count limits alone already go over the target
+		return []
+
+	if limit is None:
+		found=sorted(matches(firstMasses,residues,secondMasses,lightest,target,tolerance))
+	else:
+		# only the closest limit are wanted, and at 1000 Da there are tens of
+		# thousands within 5 ppm: start with a much narrower window and
+		# widen it until it holds enough (one more than limit, in case the
+		# empty formula is among them)
+		narrow=tolerance/1024
+		while len(found:=matches(firstMasses,residues,secondMasses,lightest,target,min(narrow,tolerance)))<=limit and narrow<tolerance:
+			narrow*=4
+		found=heapq.nsmallest(limit+1,found)
+
+	symbols=[item[0] for item in first+second]+[symbol]
+	results=[]
+	for _,index,position,count in found:
+		amounts=dict(zip(symbols,firstCounts[index]+secondCounts[position]+(count,)))
+		if not any(amounts.values()):
+			continue
+		mass=float(element.molarMass(amounts.items()))
+		results.append({"Formula":hill(amounts),"Mass":mass,"Error (ppm)":round((mass-target)/target*1e6,3)})
+	return results[:limit]
+
+def hill(amounts):
+	# carbon first, then hydrogen, then the rest alphabetically; counts of
+	# one are left out
+	symbols=sorted(symbol for symbol,count in amounts.items() if count)
+	if "C" in symbols:
+		symbols.sort(key=lambda symbol:{"C":0,"H":1}.get(symbol,2))
+	return "".join(symbol+(str(amounts[symbol]) if amounts[symbol]!=1 else "") for symbol in symbols)
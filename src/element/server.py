@@ -0,0 +1,130 @@
+# A resident query server, so callers do not pay for interpreter startup and
+# table loading on every lookup.
+#
+# The protocol is line based, over a Unix domain socket or TCP: the client
+# sends one element name, symbol, atomic number or formula per line, and for
+# every line the server answers with one line of JSON, the result dict as
+# --format jsonl would print it. Any number of queries can be sent on one
+# connection, and a client may send them all before reading the answers.
+# The line "!stats" is answered with the server's latency histogram instead,
+# and a line longer than limit with an error.
+#
+# Connections are served by one asyncio event loop. Replies are written as
+# soon as each line is evaluated, and reading from a connection pauses while
+# its client is not reading the replies. The client side is in client.py,
+# which leaves asyncio and the rest of the server unloaded.
+
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import time
+
+import element
+from .client import address
+
+# longest query line accepted, in bytes
+limit=1<<16
+
+class Histogram:
+	# request latencies in power-of-two microsecond buckets: bucket i counts
+	# the requests that took less than 2**i us (and at least 2**(i-1) us)
+	def __init__(self,size=32):
+		self.buckets=[0]*size
+		self.count=0
+
+	def record(self,seconds):
+		self.buckets[min(int(seconds*1e6).bit_length(),len(self.buckets)-1)]+=1
+		self.count+=1
+
+	def percentile(self,fraction):
+		# upper bound, in us, of the bucket holding that fraction of requests
+		seen=0
+		for bucket,count in enumerate(self.buckets):
+			seen+=count
+			if seen>=fraction*self.count:
+				return 1<<bucket
+		return 1<<(len(self.buckets)-1)
+
+	def report(self):
+		return {
+			"requests":self.count,
+			"p50 (us)":self.percentile(0.5),
+			"p90 (us)":self.percentile(0.9),
+			"p99 (us)":self.percentile(0.99),
+			"buckets (us)":{"<%d"%(1<<bucket):count for bucket,count in enumerate(self.buckets) if count},
+		}
+
+histogram=Histogram()
+
+async def readLine(reader):
+	# like reader.readline(), but a line longer than limit is read to its end
+	# and thrown away, and None returned in its place
+	try:
+		return await reader.readuntil(b"\n")
+	except asyncio.IncompleteReadError as exception:
+		return exception.partial
+	except asyncio.LimitOverrunError as exception:
+		consumed=exception.consumed
+	while True:
+		await reader.readexactly(consumed)
+		try:
+			await reader.readuntil(b"\n")
+			return None
+		except asyncio.IncompleteReadError:
+			return None
+		except asyncio.LimitOverrunError as exception:
+			consumed=exception.consumed
+
+async def handle(reader,writer):
+	header,format=element.formatter("jsonl")
+	try:
+		while (line:=await readLine(reader))!=b"":
+			start=time.perf_counter()
+			if line is None:
+				reply=format({"Error":"line longer than %d bytes"%limit})
+			elif line.strip()==b"!stats":
+				reply=format(histogram.report())
+			else:
+				reply=format(element.evaluateLine(line.decode("utf-8","replace")))
+			writer.write(reply.encode("utf-8")+b"\n")
+			histogram.record(time.perf_counter()-start)
+			# returns straight away unless the client has let its replies
+			# pile up past the transport's high-water mark
+			await writer.drain()
+	except ConnectionError:
+		# the client went away
+		pass
+	finally:
+		writer.close()
+
+async def listen(spec):
+	# shut down on SIGTERM the same way as on ^C
+	asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,asyncio.current_task().cancel)
+	where=address(spec)
+	if isinstance(where,tuple):
+		server=await asyncio.start_server(handle,*where,limit=limit,backlog=1024)
+	else:
+		server=await asyncio.start_unix_server(handle,where,limit=limit,backlog=1024)
+	async with server:
+		await server.serve_forever()
+
+def serve(spec,stats=False):
+	where=address(spec)
+	# a socket left behind by a server that did not shut down cleanly would
+	# make bind() fail
+	if isinstance(where,str) and os.path.exists(where) and stat.S_ISSOCK(os.stat(where).st_mode):
+		os.unlink(where)
+	element.FormulaParser.grammar()
+	element.massTable()
+	try:
+		asyncio.run(listen(spec))
+	except (KeyboardInterrupt,asyncio.CancelledError):
+		pass
+	finally:
+		if isinstance(where,str) and os.path.exists(where):
+			os.unlink(where)
+		if stats:
+			print(json.dumps(histogram.report()),file=sys.stderr)